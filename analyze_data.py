@@ -1,125 +1,84 @@
-import xml.etree.ElementTree as ET
-from datetime import datetime
-import statistics
-from collections import Counter
+import argparse
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from columnar import parquet_available
+from derived_metrics import reference_time
+from repo_record import load_repositories
+from repository_metrics import RepositoryMetrics
+
+# Columns used by the analysis (projection when reading the Parquet snapshot)
+ANALYSIS_COLUMNS = [
+    'name', 'stars', 'created_at', 'updated_at', 'primary_language', 'releases',
+    'open_issues', 'closed_issues', 'closed_issues_ratio', 'merged_pull_requests'
+]
 
 def parse_xml_data(filename):
-    """Parse XML file and extract repository data"""
-    tree = ET.parse(filename)
-    root = tree.getroot()
-    
-    repositories = []
-    for repo in root.findall('repository'):
-        data = {
-            'name': repo.find('name').text,
-            'stars': int(repo.find('stars').text),
-            'created_at': repo.find('created_at').text,
-            'updated_at': repo.find('updated_at').text,
-            'primary_language': repo.find('primary_language').text,
-            'releases': int(repo.find('releases').text),
-            'open_issues': int(repo.find('open_issues').text),
-            'closed_issues': int(repo.find('closed_issues').text),
-            'closed_issues_ratio': float(repo.find('closed_issues_ratio').text),
-            'merged_pull_requests': int(repo.find('merged_pull_requests').text)
-        }
-        repositories.append(data)
-    
-    return repositories
-
-def calculate_age_in_years(created_at):
-    """Calculate repository age in years"""
-    created_date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-    current_date = datetime.now(created_date.tzinfo)
-    age_years = (current_date - created_date).days / 365.25
-    return age_years
-
-def calculate_days_since_update(updated_at):
-    """Calculate days since last update"""
-    updated_date = datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
-    current_date = datetime.now(updated_date.tzinfo)
-    days_since = (current_date - updated_date).days
-    return days_since
-
-def analyze_repositories(repositories):
+    """Load repository records from the XML file (or a CSV/Parquet/SQLite snapshot)"""
+    return list(load_repositories(filename, ANALYSIS_COLUMNS))
+
+def compute_metrics(repositories, now=None):
+    """Return the RQ metrics for the records (or the metrics themselves, if already computed)"""
+    if isinstance(repositories, RepositoryMetrics):
+        return repositories
+    return RepositoryMetrics(repositories, now)
+
+def analyze_repositories(repositories, now=None):
     """Analyze repository data and answer research questions"""
     
+    metrics = compute_metrics(repositories, now)
+    
     print("=" * 80)
     print("ANÁLISE DOS 1000 REPOSITÓRIOS MAIS POPULARES DO GITHUB")
     print("=" * 80)
     
     # RQ01: Idade dos repositórios
-    ages = [calculate_age_in_years(repo['created_at']) for repo in repositories]
-    median_age = statistics.median(ages)
-    
     print(f"\nRQ01 - Sistemas populares são maduros/antigos?")
-    print(f"Idade mediana: {median_age:.1f} anos")
-    print(f"Idade mínima: {min(ages):.1f} anos")
-    print(f"Idade máxima: {max(ages):.1f} anos")
+    print(f"Idade mediana: {metrics.median('age_years'):.1f} anos")
+    print(f"Idade mínima: {metrics.minimum('age_years'):.1f} anos")
+    print(f"Idade máxima: {metrics.maximum('age_years'):.1f} anos")
     
     # RQ02: Pull requests aceitas
-    pull_requests = [repo['merged_pull_requests'] for repo in repositories]
-    median_prs = statistics.median(pull_requests)
-    
     print(f"\nRQ02 - Sistemas populares recebem muita contribuição externa?")
-    print(f"Pull requests aceitas (mediana): {median_prs}")
-    print(f"Pull requests aceitas (mínimo): {min(pull_requests)}")
-    print(f"Pull requests aceitas (máximo): {max(pull_requests)}")
+    print(f"Pull requests aceitas (mediana): {metrics.median('merged_pull_requests')}")
+    print(f"Pull requests aceitas (mínimo): {metrics.minimum('merged_pull_requests')}")
+    print(f"Pull requests aceitas (máximo): {metrics.maximum('merged_pull_requests')}")
     
     # RQ03: Releases
-    releases = [repo['releases'] for repo in repositories]
-    median_releases = statistics.median(releases)
-    
     print(f"\nRQ03 - Sistemas populares lançam releases com frequência?")
-    print(f"Total de releases (mediana): {median_releases}")
-    print(f"Total de releases (mínimo): {min(releases)}")
-    print(f"Total de releases (máximo): {max(releases)}")
+    print(f"Total de releases (mediana): {metrics.median('releases')}")
+    print(f"Total de releases (mínimo): {metrics.minimum('releases')}")
+    print(f"Total de releases (máximo): {metrics.maximum('releases')}")
     
     # RQ04: Tempo desde última atualização
-    days_since_update = [calculate_days_since_update(repo['updated_at']) for repo in repositories]
-    median_days = statistics.median(days_since_update)
-    
     print(f"\nRQ04 - Sistemas populares são atualizados com frequência?")
-    print(f"Dias desde última atualização (mediana): {median_days}")
-    print(f"Dias desde última atualização (mínimo): {min(days_since_update)}")
-    print(f"Dias desde última atualização (máximo): {max(days_since_update)}")
+    print(f"Dias desde última atualização (mediana): {metrics.median('days_since_update')}")
+    print(f"Dias desde última atualização (mínimo): {metrics.minimum('days_since_update')}")
+    print(f"Dias desde última atualização (máximo): {metrics.maximum('days_since_update')}")
     
     # RQ05: Linguagens mais populares
-    languages = [repo['primary_language'] for repo in repositories]
-    language_counts = Counter(languages)
-    
     print(f"\nRQ05 - Sistemas populares são escritos nas linguagens mais populares?")
     print("Top 10 linguagens:")
-    for lang, count in language_counts.most_common(10):
-        percentage = (count / len(repositories)) * 100
+    for lang, count, percentage in metrics.top_languages(10):
         print(f"  {lang}: {count} repositórios ({percentage:.1f}%)")
     
     # RQ06: Percentual de issues fechadas
-    closed_ratios = [repo['closed_issues_ratio'] for repo in repositories if repo['closed_issues_ratio'] > 0]
-    median_closed_ratio = statistics.median(closed_ratios)
-    
     print(f"\nRQ06 - Sistemas populares possuem um alto percentual de issues fechadas?")
-    print(f"Razão de issues fechadas (mediana): {median_closed_ratio:.2f}")
-    print(f"Razão de issues fechadas (mínima): {min(closed_ratios):.2f}")
-    print(f"Razão de issues fechadas (máxima): {max(closed_ratios):.2f}")
+    print(f"Razão de issues fechadas (mediana): {metrics.median('closed_issues_ratio'):.2f}")
+    print(f"Razão de issues fechadas (mínima): {metrics.minimum('closed_issues_ratio'):.2f}")
+    print(f"Razão de issues fechadas (máxima): {metrics.maximum('closed_issues_ratio'):.2f}")
     
     # Estatísticas adicionais
     print(f"\n" + "=" * 80)
     print("ESTATÍSTICAS ADICIONAIS")
     print("=" * 80)
     
-    # Repositórios sem issues
-    repos_no_issues = len([r for r in repositories if r['open_issues'] + r['closed_issues'] == 0])
-    print(f"Repositórios sem issues: {repos_no_issues} ({(repos_no_issues/len(repositories)*100):.1f}%)")
-    
-    # Repositórios sem releases
-    repos_no_releases = len([r for r in repositories if r['releases'] == 0])
-    print(f"Repositórios sem releases: {repos_no_releases} ({(repos_no_releases/len(repositories)*100):.1f}%)")
-    
-    # Repositórios sem PRs
-    repos_no_prs = len([r for r in repositories if r['merged_pull_requests'] == 0])
-    print(f"Repositórios sem PRs aceitas: {repos_no_prs} ({(repos_no_prs/len(repositories)*100):.1f}%)")
+    print(f"Repositórios sem issues: {metrics.no_issues} ({metrics.percentage(metrics.no_issues):.1f}%)")
+    print(f"Repositórios sem releases: {metrics.no_releases} ({metrics.percentage(metrics.no_releases):.1f}%)")
+    print(f"Repositórios sem PRs aceitas: {metrics.no_prs} ({metrics.percentage(metrics.no_prs):.1f}%)")
 
-def generate_report(repositories):
+def generate_report(repositories, now=None):
     """Generate detailed analysis report"""
     
     report = """
@@ -152,55 +111,50 @@ A análise utilizou valores medianos para reduzir o impacto de outliers.
 
 """
     
-    # Calcular métricas
-    ages = [calculate_age_in_years(repo['created_at']) for repo in repositories]
-    pull_requests = [repo['merged_pull_requests'] for repo in repositories]
-    releases = [repo['releases'] for repo in repositories]
-    days_since_update = [calculate_days_since_update(repo['updated_at']) for repo in repositories]
-    languages = [repo['primary_language'] for repo in repositories]
-    closed_ratios = [repo['closed_issues_ratio'] for repo in repositories if repo['closed_issues_ratio'] > 0]
-    
-    language_counts = Counter(languages)
+    # Métricas calculadas uma única vez (reaproveitadas se vierem de analyze_repositories)
+    metrics = compute_metrics(repositories, now)
+    median_age = metrics.median('age_years')
+    median_prs = metrics.median('merged_pull_requests')
+    median_closed_ratio = metrics.median('closed_issues_ratio')
     
     report += f"""
 ### RQ01 - Maturidade dos Sistemas
-- **Idade mediana**: {statistics.median(ages):.1f} anos
+- **Idade mediana**: {median_age:.1f} anos
 - **Resultado**: Repositórios populares são relativamente maduros
 
 ### RQ02 - Contribuição Externa
-- **PRs aceitas (mediana)**: {statistics.median(pull_requests):.0f}
+- **PRs aceitas (mediana)**: {median_prs:.0f}
 - **Resultado**: Alto nível de contribuição externa
 
 ### RQ03 - Frequência de Releases
-- **Releases (mediana)**: {statistics.median(releases):.0f}
+- **Releases (mediana)**: {metrics.median('releases'):.0f}
 - **Resultado**: Muitos projetos não fazem releases formais
 
 ### RQ04 - Frequência de Atualizações
-- **Dias desde última atualização (mediana)**: {statistics.median(days_since_update):.0f}
+- **Dias desde última atualização (mediana)**: {metrics.median('days_since_update'):.0f}
 - **Resultado**: Projetos são atualizados regularmente
 
 ### RQ05 - Linguagens Populares
 **Top 5 linguagens:**
 """
     
-    for lang, count in language_counts.most_common(5):
-        percentage = (count / len(repositories)) * 100
+    for lang, count, percentage in metrics.top_languages(5):
         report += f"- {lang}: {count} repositórios ({percentage:.1f}%)\n"
     
     report += f"""
 ### RQ06 - Qualidade (Issues Fechadas)
-- **Razão de issues fechadas (mediana)**: {statistics.median(closed_ratios):.2f}
+- **Razão de issues fechadas (mediana)**: {median_closed_ratio:.2f}
 - **Resultado**: Alto percentual de resolução de issues
 
 ## 4. DISCUSSÃO
 
 ### Confirmação das Hipóteses:
-- **H1 ✓**: Confirmada - idade mediana de {statistics.median(ages):.1f} anos indica maturidade
-- **H2 ✓**: Confirmada - mediana de {statistics.median(pull_requests):.0f} PRs indica alta colaboração
+- **H1 ✓**: Confirmada - idade mediana de {median_age:.1f} anos indica maturidade
+- **H2 ✓**: Confirmada - mediana de {median_prs:.0f} PRs indica alta colaboração
 - **H3 ✗**: Parcialmente refutada - muitos projetos não fazem releases formais
 - **H4 ✓**: Confirmada - atualizações recentes indicam manutenção ativa
 - **H5 ✓**: Confirmada - JavaScript e TypeScript dominam
-- **H6 ✓**: Confirmada - alta razão de issues fechadas ({statistics.median(closed_ratios):.2f})
+- **H6 ✓**: Confirmada - alta razão de issues fechadas ({median_closed_ratio:.2f})
 
 ### Insights Principais:
 1. Repositórios populares são projetos estabelecidos e bem mantidos
@@ -215,8 +169,40 @@ A análise utilizou valores medianos para reduzir o impacto de outliers.
     
     print(f"\nRelatório detalhado salvo em: relatorio_analise.md")
 
+def default_snapshot():
+    """Snapshot dos 1000 repositórios: o Parquet, se disponível; senão, o XML.
+
+    O SQLite não é usado por padrão porque seu snapshot mais recente pode ser
+    de outra coleta (ex.: a dos 100 repositórios); passe-o explicitamente.
+    """
+    snapshot = "Resultados/github_1000_repositories.parquet"
+    if os.path.exists(snapshot) and parquet_available():
+        return snapshot
+    return "Resultados/top_1000_repositories.xml"
+
+def load_metrics(filename, now=None, sketch_k=None):
+    """RQ metrics for one file in a single streaming pass, without keeping the records in memory"""
+    return RepositoryMetrics(load_repositories(filename, ANALYSIS_COLUMNS), now, sketch_k)
+
+def main():
+    parser = argparse.ArgumentParser(description="Análise dos repositórios mais populares do GitHub")
+    parser.add_argument("files", nargs="*",
+                        help="XML, CSV, Parquet ou SQLite; vários arquivos são lidos em paralelo e analisados juntos")
+    parser.add_argument("--sketch-k", type=int,
+                        help="medianas aproximadas com sketch KLL de tamanho K (memória constante; erro de rank ~2/K)")
+    args = parser.parse_args()
+    
+    files = args.files or [default_snapshot()]
+    now = reference_time()
+    if len(files) == 1:
+        metrics = load_metrics(files[0], now, args.sketch_k)
+    else:
+        with ProcessPoolExecutor() as pool:
+            shards = list(pool.map(load_metrics, files, [now] * len(files), [args.sketch_k] * len(files)))
+        metrics = functools.reduce(RepositoryMetrics.merge, shards)
+    
+    analyze_repositories(metrics)
+    generate_report(metrics)
+
 if __name__ == "__main__":
-    # Analisar dados dos 1000 repositórios
-    repositories = parse_xml_data("Resultados/top_1000_repositories.xml")
-    analyze_repositories(repositories)
-    generate_report(repositories)
\ No newline at end of file
+    main()
\ No newline at end of file
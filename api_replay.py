@@ -0,0 +1,399 @@
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlencode, urlparse
+
+from rate_limit import resource_for
+
+ERROR_STATUSES = (502, 503, 403)
+RATE_LIMIT = 5000
+RATE_LIMIT_WINDOW = 3600
+# Janela do limite próprio da busca do GitHub (30 requisições por minuto)
+SEARCH_RATE_LIMIT = 30
+SEARCH_WINDOW = 60
+
+def exchange_key(method, path, body):
+    """Chave de uma troca HTTP: método, caminho (sem codificação) e corpo JSON canônico"""
+    key = f"{method} {unquote(path)}"
+    if body is not None:
+        key += " " + hashlib.sha1(json.dumps(body, sort_keys=True).encode("utf-8")).hexdigest()
+    return key
+
+def load_cassette(path):
+    """Lê uma gravação de http_client.start_recording; chaves repetidas viram uma sequência de respostas"""
+    exchanges = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            exchanges.setdefault(exchange_key(entry["method"], entry["path"], entry["body"]), []).append(entry)
+    return exchanges
+
+class CassetteResponder:
+    """Responde com as trocas de uma gravação (chaves repetidas são servidas em ordem)"""
+
+    def __init__(self, exchanges):
+        self.exchanges = exchanges
+        self._positions = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, method, path, body, request_headers):
+        key = exchange_key(method, path, body)
+        responses = self.exchanges.get(key)
+        if not responses:
+            return None
+        with self._lock:
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+        # A última resposta se repete quando a sequência acaba
+        entry = responses[min(position, len(responses) - 1)]
+        # Cabeçalhos gravados de rate limit são substituídos pelo orçamento do servidor
+        headers = {name: value for name, value in entry["headers"].items() if not name.startswith("X-RateLimit")}
+        return entry["status"], headers, entry["response"]
+
+LANGUAGES = ["JavaScript", "Python", "TypeScript", "Go", "Java", "C++", "Rust", "C", None]
+
+class SyntheticGitHub:
+    """Responde com dados sintéticos e determinísticos para as consultas usadas pelos coletores.
+
+    Gera `total_repos` repositórios ordenados por estrelas e entende a busca (com
+    filtros stars:/created:, cursores e repositoryCount), consultas de repository
+    com ou sem aliases e os endpoints REST de busca, /repos, releases, issues e pulls
+    (com cabeçalho Link e ETag). Serve para medir os coletores sem acesso ao GitHub.
+    """
+
+    def __init__(self, total_repos=10000, seed=0):
+        rng = random.Random(seed)
+        self.repos = []
+        for i in range(total_repos):
+            created = 1199145600 + rng.randrange(16 * 365 * 86400)
+            repo = {
+                "owner": f"owner{i}",
+                "name": f"repo{i}",
+                "stars": max(1, int(500000 / (i + 1) ** 0.75)),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(created)),
+                "updated": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(1750000000 + rng.randrange(90 * 86400))),
+                "language": rng.choice(LANGUAGES),
+                "releases": rng.randrange(0, 400),
+                "open_issues": rng.randrange(0, 3000),
+                "closed_issues": rng.randrange(0, 30000),
+                "merged_pull_requests": rng.randrange(0, 20000)
+            }
+            repo["closed_pull_requests"] = repo["merged_pull_requests"] + rng.randrange(0, 2000)
+            self.repos.append(repo)
+        self.by_name = {(repo["owner"], repo["name"]): repo for repo in self.repos}
+
+    def __call__(self, method, path, body, request_headers):
+        if method == "POST" and path.startswith("/graphql"):
+            return 200, {}, json.dumps(self._graphql(body["query"], body.get("variables") or {}))
+
+        url = urlparse(path)
+        params = {name: values[0] for name, values in parse_qs(url.query).items()}
+        payload, headers = self._rest(url.path, params)
+        if payload is None:
+            return None
+        text = json.dumps(payload)
+        etag = '"%s"' % hashlib.sha1(text.encode("utf-8")).hexdigest()
+        if request_headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, ""
+        return 200, {"ETag": etag, **headers}, text
+
+    def _search(self, qualifiers):
+        stars = re.search(r"stars:(>=|>)?(\d+)(?:\.\.(\d+))?", qualifiers)
+        low, high = 0, float("inf")
+        if stars:
+            low = int(stars.group(2)) + (1 if stars.group(1) == ">" else 0)
+            if not stars.group(1):
+                high = int(stars.group(3) or stars.group(2))
+        created = re.search(r"created:(\S+)\.\.(\S+)", qualifiers)
+        matches = [repo for repo in self.repos if low <= repo["stars"] <= high]
+        if created:
+            start, end = created.group(1), created.group(2) + "T23:59:59Z"
+            matches = [repo for repo in matches if start <= repo["created"] <= end]
+        return matches
+
+    def _node(self, repo):
+        return {
+            "name": repo["name"],
+            "owner": {"login": repo["owner"]},
+            "stargazerCount": repo["stars"],
+            "createdAt": repo["created"],
+            "updatedAt": repo["updated"],
+            "pushedAt": repo["updated"],
+            "primaryLanguage": {"name": repo["language"]} if repo["language"] else None,
+            "releases": {"totalCount": repo["releases"]},
+            "issues": {"totalCount": repo["open_issues"]},
+            "closedIssues": {"totalCount": repo["closed_issues"]},
+            "pullRequests": {"totalCount": repo["merged_pull_requests"]}
+        }
+
+    @staticmethod
+    def _query_cost(query, variables):
+        """Custo em pontos pela regra do GitHub: conexões pedidas (multiplicadas pelos nós do pai) / 100, mínimo 1"""
+        connections = len(re.findall(r"\{\s*totalCount\s*\}", query))
+        if "search(" in query and "repositoryCount" not in query:
+            # A busca é uma conexão e cada nó da página traz as conexões aninhadas
+            requests = 1 + connections * variables.get("perPage", 1)
+        else:
+            requests = max(connections, 1)
+        return max(1, round(requests / 100))
+
+    def _graphql(self, query, variables):
+        # remaining/resetAt são preenchidos pelo servidor com o orçamento dele
+        data = {"rateLimit": {"cost": self._query_cost(query, variables), "remaining": 0, "resetAt": None}}
+        if "search(" in query:
+            matches = self._search(variables.get("searchQuery", ""))
+            if "repositoryCount" in query:
+                data["search"] = {"repositoryCount": len(matches)}
+                return {"data": data}
+            start = int(variables.get("cursor") or 0)
+            end = start + variables["perPage"]
+            data["search"] = {
+                "pageInfo": {"endCursor": str(end), "hasNextPage": end < len(matches)},
+                "edges": [{"node": self._node(repo)} for repo in matches[start:end]]
+            }
+        for alias, owner, name in re.findall(r"(\w+): repository\(owner: \$(\w+), name: \$(\w+)\)", query):
+            repo = self.by_name.get((variables[owner], variables[name]))
+            data[alias] = self._node(repo) if repo else None
+        if re.search(r"^\s*repository\(", query, re.MULTILINE):
+            repo = self.by_name.get((variables["owner"], variables["name"]))
+            data["repository"] = self._node(repo) if repo else None
+        return {"data": data}
+
+    def _rest_repo(self, repo):
+        return {
+            "name": repo["name"],
+            "full_name": f"{repo['owner']}/{repo['name']}",
+            "owner": {"login": repo["owner"]},
+            "stargazers_count": repo["stars"],
+            "forks_count": repo["stars"] // 10,
+            "open_issues_count": repo["open_issues"],
+            "created_at": repo["created"],
+            "updated_at": repo["updated"],
+            "language": repo["language"]
+        }
+
+    def _page(self, path, params, total, item):
+        page = int(params.get("page", 1))
+        per_page = int(params.get("per_page", 30))
+        start = (page - 1) * per_page
+        items = [item(i) for i in range(start, min(start + per_page, total))]
+        headers = {}
+        last = max((total + per_page - 1) // per_page, 1)
+        if last > 1:
+            query = {name: value for name, value in params.items() if name != "page"}
+            base = f"{path}?{urlencode(query)}"
+            links = [f'<{base}&page={last}>; rel="last"']
+            if page < last:
+                links.insert(0, f'<{base}&page={page + 1}>; rel="next"')
+            headers["Link"] = ", ".join(links)
+        return items, headers
+
+    def _rest(self, path, params):
+        if path == "/search/repositories":
+            matches = self._search(params.get("q", ""))
+            page = int(params.get("page", 1))
+            per_page = int(params.get("per_page", 30))
+            items = matches[(page - 1) * per_page:page * per_page]
+            return {"total_count": len(matches), "items": [self._rest_repo(repo) for repo in items]}, {}
+        if path == "/search/issues":
+            match = re.search(r"repo:([^/\s]+)/(\S+)", params.get("q", ""))
+            repo = self.by_name.get((match.group(1), match.group(2))) if match else None
+            return ({"total_count": repo["merged_pull_requests"], "items": []}, {}) if repo else (None, {})
+
+        parts = path.strip("/").split("/")
+        if len(parts) < 3 or parts[0] != "repos" or (parts[1], parts[2]) not in self.by_name:
+            return None, {}
+        repo = self.by_name[(parts[1], parts[2])]
+        if len(parts) == 3:
+            return self._rest_repo(repo), {}
+        if parts[3] == "releases":
+            return self._page(path, params, repo["releases"], lambda i: {"id": i})
+        if parts[3] == "issues":
+            total = repo["closed_issues"] if params.get("state") == "closed" else repo["open_issues"]
+            return self._page(path, params, total, lambda i: {"number": i})
+        if parts[3] == "pulls":
+            merged = repo["merged_pull_requests"]
+            return self._page(path, params, repo["closed_pull_requests"],
+                              lambda i: {"number": i, "merged_at": "2024-01-01T00:00:00Z" if i < merged else None})
+        return None, {}
+
+class ReplayServer(ThreadingHTTPServer):
+    """Servidor local que imita a API do GitHub.
+
+    As respostas vêm de `responder` (uma gravação via CassetteResponder ou dados
+    sintéticos via SyntheticGitHub). Permite acrescentar latência, injetar erros (502/503 e 403 de limite secundário
+    com Retry-After) e controla cabeçalhos X-RateLimit-* com um orçamento próprio. Com
+    `search_rate_limit`, as rotas /search/* têm um orçamento separado por minuto, como no GitHub.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, responder, latency=0.0, error_rate=0.0, error_statuses=ERROR_STATUSES,
+                 retry_after=1, rate_limit=RATE_LIMIT, search_rate_limit=None, seed=None):
+        super().__init__(address, ReplayHandler)
+        self.responder = responder
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.retry_after = retry_after
+        self.rate_limit = rate_limit
+        self.search_rate_limit = search_rate_limit
+        # Orçamento de cada recurso: {"limit", "window", "remaining", "reset_at"}
+        self.budgets = {}
+        self.requests = 0
+        self.cost = 0
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _budget(self, resource):
+        # Sem search_rate_limit, todos os recursos dividem o mesmo orçamento
+        if resource == "search" and self.search_rate_limit:
+            key, limit, window = resource, self.search_rate_limit, SEARCH_WINDOW
+        else:
+            key, limit, window = None, self.rate_limit, RATE_LIMIT_WINDOW
+        budget = self.budgets.get(key)
+        if budget is None or time.time() >= budget["reset_at"]:
+            budget = {"limit": limit, "remaining": limit, "reset_at": int(time.time()) + window}
+            self.budgets[key] = budget
+        return budget
+
+    def consume_budget(self, resource="core"):
+        """Desconta uma requisição do orçamento do recurso e retorna (limite, restante, reset)"""
+        with self._lock:
+            self.requests += 1
+            budget = self._budget(resource)
+            budget["remaining"] = max(budget["remaining"] - 1, 0)
+            return budget["limit"], budget["remaining"], budget["reset_at"]
+
+    def charge(self, status, cost=1, resource="core"):
+        """Soma o custo da resposta (pontos, no GraphQL) e retorna o orçamento restante do recurso"""
+        with self._lock:
+            budget = self._budget(resource)
+            # Respostas 304 não contam no rate limit do GitHub
+            if status != 304:
+                self.cost += cost
+                # consume_budget já descontou 1 ponto na chegada da requisição
+                budget["remaining"] = max(budget["remaining"] - (cost - 1), 0)
+            return budget["remaining"]
+
+    def inject_error(self):
+        with self._lock:
+            if self.error_rate and self.random.random() < self.error_rate:
+                return self.random.choice(self.error_statuses)
+        return None
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Cabeçalhos e corpo saem em escritas separadas; sem isso o Nagle soma ~40ms por resposta
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._reply(None)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length)) if length else None
+        self._reply(body)
+
+    def _reply(self, body):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+        resource = resource_for(self.path)
+        limit, remaining, reset_at = server.consume_budget(resource)
+        headers = {
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(reset_at),
+            "X-RateLimit-Used": str(limit - remaining),
+            "X-RateLimit-Resource": resource
+        }
+
+        status = server.inject_error()
+        if status == 403:
+            headers["Retry-After"] = str(server.retry_after)
+            self._send(403, headers, json.dumps({"message": "You have exceeded a secondary rate limit."}))
+            return
+        if status is not None:
+            self._send(status, headers, json.dumps({"message": "Server Error"}))
+            return
+        if remaining == 0:
+            self._send(403, headers, json.dumps({"message": "API rate limit exceeded"}))
+            return
+
+        reply = server.responder(self.command, self.path, body, self.headers)
+        if reply is None:
+            self._send(404, headers, json.dumps({"message": f"Sem resposta para {self.command} {self.path}"}))
+            return
+        status, reply_headers, text = reply
+        if self.path.startswith("/graphql") and status == 200:
+            # O objeto rateLimit da resposta acompanha o orçamento do servidor, como os cabeçalhos
+            data = json.loads(text)
+            if (data.get("data") or {}).get("rateLimit"):
+                remaining = server.charge(status, data["data"]["rateLimit"]["cost"], resource)
+                headers["X-RateLimit-Remaining"] = str(remaining)
+                headers["X-RateLimit-Used"] = str(limit - remaining)
+                data["data"]["rateLimit"]["remaining"] = remaining
+                data["data"]["rateLimit"]["resetAt"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(reset_at))
+                text = json.dumps(data)
+            else:
+                server.charge(status, resource=resource)
+        else:
+            server.charge(status, resource=resource)
+        self._send(status, {**reply_headers, **headers}, text)
+
+    def _send(self, status, headers, text):
+        payload = text.encode("utf-8")
+        self.send_response(status)
+        headers.setdefault("Content-Type", "application/json; charset=utf-8")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(responder, host="127.0.0.1", port=0, **options):
+    """Sobe o servidor em uma thread e retorna a instância (server.url é o endereço base)"""
+    server = ReplayServer((host, port), responder, **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Imita a API do GitHub localmente")
+    parser.add_argument("cassette", nargs="?", help="arquivo gravado com GITHUB_API_RECORD")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="serve N repositórios sintéticos em vez de uma gravação")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="atraso por requisição, em segundos")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fração de respostas com erro injetado")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After dos 403 injetados")
+    parser.add_argument("--rate-limit", type=int, default=RATE_LIMIT, help="orçamento por janela de uma hora")
+    parser.add_argument("--search-rate-limit", type=int, nargs="?", const=SEARCH_RATE_LIMIT,
+                        help=f"orçamento separado da busca por minuto (sem valor: {SEARCH_RATE_LIMIT}, como no GitHub)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    if args.synthetic:
+        responder = SyntheticGitHub(args.synthetic, args.seed or 0)
+    elif args.cassette:
+        responder = CassetteResponder(load_cassette(args.cassette))
+    else:
+        parser.error("informe uma gravação ou --synthetic N")
+
+    server = ReplayServer((args.host, args.port), responder, latency=args.latency,
+                          error_rate=args.error_rate, retry_after=args.retry_after,
+                          rate_limit=args.rate_limit, search_rate_limit=args.search_rate_limit, seed=args.seed)
+    print(f"Servindo em {server.url} (use GITHUB_API_URL={server.url})")
+    server.serve_forever()
\ No newline at end of file
@@ -0,0 +1,54 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from graphQl import run_query, get_top_repo_ids, get_repo_details, get_repos_details_batch
+from generate_xml import write_repositories_xml
+
+# Número máximo de requisições em andamento ao mesmo tempo
+CONCURRENCY = 8
+
+async def run_query_async(query, variables=None, retries=None):
+    """Versão assíncrona de run_query (a requisição bloqueante roda em uma thread do executor)"""
+    return await asyncio.to_thread(run_query, query, variables, retries)
+
+async def get_repo_details_async(owner, name):
+    """Versão assíncrona de get_repo_details"""
+    return await asyncio.to_thread(get_repo_details, owner, name)
+
+async def get_repos_details_async(repos, concurrency=CONCURRENCY, batch_size=1):
+    """Busca os detalhes de todos os repositórios com no máximo `concurrency` requisições simultâneas.
+
+    Com batch_size > 1, cada requisição usa a consulta com aliases de get_repos_details_batch.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(batch):
+        async with semaphore:
+            if batch_size == 1:
+                repo = batch[0]
+                return [await get_repo_details_async(repo["owner"]["login"], repo["name"])]
+            return await asyncio.to_thread(get_repos_details_batch, batch, batch_size)
+
+    batches = [repos[i:i + batch_size] for i in range(0, len(repos), batch_size)]
+    results = await asyncio.gather(*(fetch(batch) for batch in batches))
+    return [details for batch in results for details in batch]
+
+async def collect_top_repos_async(total_repos=100, concurrency=CONCURRENCY, batch_size=1):
+    """Equivalente assíncrono de collect_top_repos em duas etapas: busca e detalhes concorrentes"""
+    # O executor padrão do asyncio pode ter menos threads que a concorrência pedida
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+
+    repos = await asyncio.to_thread(get_top_repo_ids, total_repos)
+    details = await get_repos_details_async(repos, concurrency, batch_size)
+    return list(zip(repos, details))
+
+def collect_and_generate_xml_async(total_repos=1000, output_file="github_repositories.xml",
+                                   concurrency=CONCURRENCY, batch_size=1):
+    repos = asyncio.run(collect_top_repos_async(total_repos, concurrency, batch_size))
+    return write_repositories_xml(repos, output_file)
+
+if __name__ == "__main__":
+    start_time = time.time()
+    collect_and_generate_xml_async()
+    print(f"Tempo total de execução: {time.time() - start_time:.2f} segundos")
\ No newline at end of file
@@ -0,0 +1,125 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import time
+
+import api_replay
+import async_collector
+import graphQl
+import http_client
+import rest
+from token_pool import TokenPool, load_tokens
+
+SIZES = [100, 1000, 10000]
+# Atraso simulado por requisição, para que a rede domine como numa coleta real
+LATENCY = 0.01
+
+def rest_per_endpoint(total_repos):
+    repos = rest.get_popular_repositories("stars:>1", total_repos)
+    for repo in repos:
+        owner, name = repo["owner"]["login"], repo["name"]
+        rest.get_repository_details(owner, name)
+        rest.get_pull_requests(owner, name)
+        rest.get_releases(owner, name)
+        rest.get_clossed_issues(owner, name)
+        rest.get_issues(owner, name)
+        rest.get_repository_age(owner, name)
+        rest.get_last_updated(owner, name)
+        rest.get_primary_language(owner, name)
+    return len(repos)
+
+def graphql_per_repo(total_repos):
+    repos = graphQl.get_top_repo_ids(total_repos)
+    for repo in repos:
+        graphQl.get_repo_details(repo["owner"]["login"], repo["name"])
+    return len(repos)
+
+def graphql_batched(total_repos):
+    repos = graphQl.get_top_repo_ids(total_repos)
+    return len(graphQl.get_repos_details_batch(repos))
+
+def graphql_single_pass(total_repos):
+    return len(graphQl.get_top_repos_with_details(total_repos))
+
+def graphql_async(total_repos):
+    return len(asyncio.run(async_collector.collect_top_repos_async(total_repos)))
+
+STRATEGIES = {
+    "rest": rest_per_endpoint,
+    "graphql": graphql_per_repo,
+    "graphql-batch": graphql_batched,
+    "graphql-single-pass": graphql_single_pass,
+    "graphql-async": graphql_async
+}
+
+def _reset_clients():
+    """Zera sessões, caches e orçamentos para que cada medição comece do mesmo estado"""
+    http_client.configure()
+    rest.cache = None
+    rest._fetch_repository.cache_clear()
+    rest.token_pool = TokenPool(load_tokens(rest.token))
+    graphQl.token_pool = TokenPool(load_tokens(graphQl.TOKEN))
+
+def run_benchmark(strategy, total_repos, latency=LATENCY, error_rate=0.0, search_rate_limit=None):
+    """Executa uma estratégia contra o servidor sintético e retorna as métricas medidas"""
+    server = api_replay.start_server(api_replay.SyntheticGitHub(total_repos), latency=latency,
+                                     error_rate=error_rate, rate_limit=10 ** 9,
+                                     search_rate_limit=search_rate_limit, seed=0)
+    http_client.API_URL = server.url
+    _reset_clients()
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            collected = STRATEGIES[strategy](total_repos)
+        wall_time = time.perf_counter() - start
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    stats = http_client.transfer_stats()
+    return {
+        "strategy": strategy,
+        "repos": total_repos,
+        "collected": collected,
+        "wall_time": wall_time,
+        "requests": stats["requests"],
+        "bytes": stats["bytes"],
+        "cost": server.cost,
+        "client_cost": graphQl.token_pool.total_cost(),
+        "p50": stats["p50"],
+        "p95": stats["p95"]
+    }
+
+def print_results(results):
+    print(f"{'estratégia':<22}{'N':>7}{'tempo (s)':>11}{'requisições':>13}{'bytes':>13}{'custo':>9}"
+          f"{'pontos':>9}{'p50 (ms)':>10}{'p95 (ms)':>10}")
+    for r in results:
+        print(f"{r['strategy']:<22}{r['repos']:>7}{r['wall_time']:>11.2f}{r['requests']:>13}{r['bytes']:>13}"
+              f"{r['cost']:>9}{r['client_cost']:>9}{r['p50'] * 1000:>10.1f}{r['p95'] * 1000:>10.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara as estratégias de coleta contra uma API simulada")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--strategies", nargs="+", choices=list(STRATEGIES), default=list(STRATEGIES))
+    parser.add_argument("--latency", type=float, default=LATENCY, help="atraso por requisição, em segundos")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--search-rate-limit", type=int, nargs="?", const=api_replay.SEARCH_RATE_LIMIT,
+                        help="limita /search/* a N requisições por minuto (sem valor: 30, como no GitHub)")
+    parser.add_argument("--output", help="salva os resultados em JSON para comparar execuções")
+    args = parser.parse_args()
+
+    results = []
+    for total_repos in args.sizes:
+        for strategy in args.strategies:
+            result = run_benchmark(strategy, total_repos, args.latency, args.error_rate, args.search_rate_limit)
+            results.append(result)
+            print(f"{strategy} N={total_repos}: {result['wall_time']:.2f}s")
+
+    print()
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResultados salvos em: {args.output}")
\ No newline at end of file
@@ -0,0 +1,182 @@
+import json
+import os
+
+from graphQl import (iter_search_pages, get_repo_details, get_repos_details_batch, get_top_repo_ids,
+                     get_top_repos_with_details, SEARCH_FIELDS, REPO_FIELDS, SINGLE_PASS_PAGE_SIZE)
+from search_shards import SEARCH_CAP
+
+# Quantas vezes a fila de repositórios com falha é reprocessada no fim da coleta
+RETRY_ROUNDS = 2
+
+def repo_key(repo):
+    return f"{repo['owner']['login']}/{repo['name']}"
+
+def failures_path(journal_file):
+    """Arquivo onde ficam as falhas permanentes de uma coleta encerrada"""
+    return os.path.splitext(journal_file)[0] + ".failed.jsonl"
+
+class CollectionJournal:
+    """Diário append-only (JSON Lines) de uma coleta em andamento.
+
+    Guarda as páginas da busca com o último cursor, os detalhes já obtidos e os
+    repositórios que falharam, para que uma nova execução continue de onde parou.
+    O diário vale para uma única coleta: close() o encerra depois que o XML é
+    gravado, e a execução seguinte começa uma busca nova.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.repos = []
+        self.cursor = None
+        self.search_done = False
+        self.details = {}
+        self.failed = {}
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Última linha incompleta de uma execução interrompida
+                    continue
+                if entry["type"] == "page":
+                    self._apply_page(entry["repos"], entry["cursor"], entry["has_next"])
+                elif entry["type"] == "details":
+                    self.details[entry["name"]] = entry["details"]
+                    self.failed.pop(entry["name"], None)
+                elif entry["type"] == "failed":
+                    self.failed[entry["name"]] = entry["error"]
+
+    def _apply_page(self, repos, cursor, has_next):
+        self.repos.extend(repos)
+        self.cursor = cursor
+        self.search_done = not has_next
+        for repo in repos:
+            # No modo de passada única os nós da busca já trazem as métricas
+            if "releases" in repo:
+                self.details[repo_key(repo)] = repo
+
+    def _append(self, entry):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+
+    def record_page(self, repos, cursor, has_next):
+        self._apply_page(repos, cursor, has_next)
+        self._append({"type": "page", "repos": repos, "cursor": cursor, "has_next": has_next})
+
+    def record_details(self, repo, details):
+        name = repo_key(repo)
+        self.details[name] = details
+        self.failed.pop(name, None)
+        self._append({"type": "details", "name": name, "details": details})
+
+    def record_failure(self, repo, error):
+        name = repo_key(repo)
+        self.failed[name] = str(error)
+        self._append({"type": "failed", "name": name, "error": str(error)})
+
+    def pending(self):
+        return [repo for repo in self.repos if repo_key(repo) not in self.details]
+
+    def close(self):
+        """Encerra a coleta: move as falhas permanentes para failures_path() e remove o diário"""
+        failures_file = failures_path(self.path)
+        if self.failed:
+            with open(failures_file, "w", encoding="utf-8") as f:
+                for name, error in self.failed.items():
+                    f.write(json.dumps({"name": name, "error": error}) + "\n")
+        elif os.path.exists(failures_file):
+            os.remove(failures_file)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def _resume_search(journal, total_repos, single_pass):
+    """Continua a busca do cursor do diário, registrando e gerando cada página assim que chega"""
+    if total_repos > SEARCH_CAP:
+        # A busca dividida em faixas não tem um cursor único; é registrada como uma página só
+        repos = get_top_repos_with_details(total_repos) if single_pass else get_top_repo_ids(total_repos)
+        journal.record_page(repos, None, False)
+        yield repos
+        return
+    if single_pass:
+        try:
+            for page in iter_search_pages(total_repos - len(journal.repos), SEARCH_FIELDS + REPO_FIELDS,
+                                          SINGLE_PASS_PAGE_SIZE, journal.cursor):
+                journal.record_page(*page)
+                yield page[0]
+            return
+        except Exception as e:
+            print(f"Consulta combinada falhou ({e}), continuando em duas etapas a partir da página atual...")
+    for page in iter_search_pages(total_repos - len(journal.repos), SEARCH_FIELDS, 100, journal.cursor):
+        journal.record_page(*page)
+        yield page[0]
+
+def _fetch_pending(journal, repos, batch_size):
+    for start in range(0, len(repos), batch_size):
+        batch = repos[start:start + batch_size]
+        try:
+            for repo, details in zip(batch, get_repos_details_batch(batch, batch_size)):
+                if details is None:
+                    journal.record_failure(repo, "repositório não encontrado")
+                else:
+                    journal.record_details(repo, details)
+            continue
+        except Exception as e:
+            print(f"Lote falhou ({e}), buscando repositórios individualmente...")
+
+        for repo in batch:
+            try:
+                details = get_repo_details(repo["owner"]["login"], repo["name"])
+                if details is None:
+                    raise Exception("repositório não encontrado")
+                journal.record_details(repo, details)
+            except Exception as e:
+                print(f"Falha em {repo_key(repo)}: {e} (adicionado à fila de nova tentativa)")
+                journal.record_failure(repo, e)
+
+def _collected(journal, repos, emitted):
+    """Pares (repo, details) de `repos` que já têm detalhes e ainda não foram gerados"""
+    for repo in repos:
+        name = repo_key(repo)
+        if name in journal.details and name not in emitted:
+            emitted.add(name)
+            yield repo, journal.details[name]
+
+def iter_top_repos_resumable(journal, total_repos=100, single_pass=True, batch_size=50):
+    """Versão de iter_top_repos que grava o progresso no diário `journal` e retoma a partir dele.
+
+    Os pares saem página a página, na ordem da busca. Repositórios que falharem vão
+    para uma fila de nova tentativa e, se a nova tentativa funcionar, saem no final; os
+    que continuarem falhando são omitidos e vão para failures_path() quando o diário é encerrado.
+    """
+    emitted = set()
+    if journal.repos:
+        print(f"Retomando coleta: {len(journal.repos)} repositórios na busca, {len(journal.details)} com detalhes")
+        repos = journal.repos[:total_repos]
+        _fetch_pending(journal, [repo for repo in repos if repo_key(repo) not in journal.details], batch_size)
+        yield from _collected(journal, repos, emitted)
+
+    if not journal.search_done and len(journal.repos) < total_repos:
+        for page in _resume_search(journal, total_repos, single_pass):
+            _fetch_pending(journal, [repo for repo in page if repo_key(repo) not in journal.details], batch_size)
+            yield from _collected(journal, page, emitted)
+
+    repos = journal.repos[:total_repos]
+    for _ in range(RETRY_ROUNDS):
+        retry_queue = [repo for repo in repos if repo_key(repo) in journal.failed]
+        if not retry_queue:
+            break
+        print(f"Tentando novamente {len(retry_queue)} repositórios com falha...")
+        _fetch_pending(journal, retry_queue, 1)
+        yield from _collected(journal, retry_queue, emitted)
+
+    if journal.failed:
+        print(f"{len(journal.failed)} repositórios continuam com falha (registrados em {failures_path(journal.path)})")
+
+def collect_top_repos_resumable(journal, total_repos=100, single_pass=True, batch_size=50):
+    """Retorna a lista de pares (repo, details) de iter_top_repos_resumable"""
+    return list(iter_top_repos_resumable(journal, total_repos, single_pass, batch_size))
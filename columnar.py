@@ -0,0 +1,99 @@
+import os
+
+from derived_metrics import parse_timestamps
+
+# Linhas acumuladas antes de gravar cada row group do Parquet
+ROW_GROUP_SIZE = 50000
+
+def _schema():
+    """Mesmas colunas do CSV, com contagens int64, datas como timestamp e linguagem dicionarizada"""
+    import pyarrow as pa
+
+    timestamp = pa.timestamp("s", tz="UTC")
+    return pa.schema([
+        ("name", pa.string()),
+        ("owner", pa.string()),
+        ("repo_name", pa.string()),
+        ("stars", pa.int64()),
+        ("created_at", timestamp),
+        ("updated_at", timestamp),
+        ("primary_language", pa.dictionary(pa.int32(), pa.string())),
+        ("releases", pa.int64()),
+        ("open_issues", pa.int64()),
+        ("closed_issues", pa.int64()),
+        ("closed_issues_ratio", pa.float64()),
+        ("merged_pull_requests", pa.int64()),
+        ("age_years", pa.float64()),
+        ("days_since_update", pa.int64()),
+    ])
+
+def parquet_available():
+    try:
+        import pyarrow.parquet  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def snapshot_path(csv_file):
+    """Caminho do snapshot Parquet gravado ao lado de um CSV"""
+    return os.path.splitext(csv_file)[0] + ".parquet"
+
+class ParquetSnapshotWriter:
+    """Grava linhas no formato do CSV (mesmas colunas) em um Parquet tipado, em row groups"""
+
+    def __init__(self, path, row_group_size=ROW_GROUP_SIZE):
+        import pyarrow.parquet as pq
+
+        self.schema = _schema()
+        self.row_group_size = row_group_size
+        self.rows = []
+        self.writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+
+    def write(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        import pyarrow as pa
+
+        if not self.rows:
+            return
+        columns = {name: [row[name] for row in self.rows] for name in self.schema.names}
+        for name in ("created_at", "updated_at"):
+            columns[name] = pa.array(parse_timestamps(columns[name])).cast(self.schema.field(name).type)
+        self.writer.write_table(pa.Table.from_pydict(columns, schema=self.schema))
+        self.rows = []
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def merge_parquet(shard_files, path):
+    """Concatena Parquets de shards (na ordem dada) em um único snapshot"""
+    import pyarrow.parquet as pq
+
+    schema = _schema()
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for shard_file in shard_files:
+            # O Parquet guarda timestamps em ms; o cast volta para o schema original
+            writer.write_table(pq.read_table(shard_file).cast(schema))
+
+def read_snapshot(csv_file, columns=None):
+    """Carrega um snapshot como DataFrame, lendo só as colunas pedidas.
+
+    Usa o Parquet gravado ao lado do CSV quando ele existe e o pyarrow está
+    instalado; caso contrário, lê o próprio CSV.
+    """
+    import pandas as pd
+
+    parquet_file = snapshot_path(csv_file)
+    if os.path.exists(parquet_file) and parquet_available():
+        return pd.read_parquet(parquet_file, columns=columns)
+    return pd.read_csv(csv_file, usecols=columns)
@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+
+import numpy as np
+
+from repo_record import CSV_FIELDS
+
+SECONDS_PER_DAY = 86400
+DAYS_PER_YEAR = 365.25
+
+# Registros convertidos por vez em iter_rows
+CHUNK_SIZE = 50000
+
+def reference_time():
+    """Instante de referência ("agora", em UTC) compartilhado por todas as linhas de uma execução"""
+    return np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None), 's')
+
+def parse_timestamps(values):
+    """Converte datas ISO do GitHub ('2015-11-07T03:09:04Z') em um array datetime64[s]"""
+    return np.array([value[:-1] for value in values], dtype='datetime64[s]')
+
+def derive(created_at, updated_at, open_issues, closed_issues, now=None):
+    """Calcula idade, dias desde a atualização e razão de issues fechadas (sem arredondar) para a coluna inteira.
+
+    Todas as linhas usam o mesmo `now`; os dias são arredondados para baixo,
+    como em timedelta.days.
+    """
+    if now is None:
+        now = reference_time()
+    age_days = (now - parse_timestamps(created_at)).astype(np.int64) // SECONDS_PER_DAY
+    days_since_update = (now - parse_timestamps(updated_at)).astype(np.int64) // SECONDS_PER_DAY
+
+    open_issues = np.asarray(open_issues, dtype=np.int64)
+    closed_issues = np.asarray(closed_issues, dtype=np.int64)
+    total_issues = open_issues + closed_issues
+    closed_ratio = np.divide(closed_issues, total_issues, out=np.zeros(len(total_issues)), where=total_issues > 0)
+
+    return {
+        'age_years': age_days / DAYS_PER_YEAR,
+        'days_since_update': days_since_update,
+        'closed_issues_ratio': closed_ratio,
+    }
+
+def derive_records(records, now=None):
+    """derive() aplicado a uma lista de RepoRecord"""
+    return derive(
+        [record.created_at for record in records],
+        [record.updated_at for record in records],
+        [record.open_issues for record in records],
+        [record.closed_issues for record in records],
+        now,
+    )
+
+def iter_rows(records, now=None, chunk_size=CHUNK_SIZE):
+    """Gera as linhas do CSV/Parquet, calculando as colunas derivadas em blocos de chunk_size registros"""
+    if now is None:
+        now = reference_time()
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield from _chunk_rows(chunk, now)
+            chunk = []
+    yield from _chunk_rows(chunk, now)
+
+def _chunk_rows(records, now):
+    if not records:
+        return
+    metrics = derive_records(records, now)
+    age_years = np.round(metrics['age_years'], 2).tolist()
+    days_since_update = metrics['days_since_update'].tolist()
+    for record, age, days in zip(records, age_years, days_since_update):
+        row = {name: getattr(record, name) for name in CSV_FIELDS[:-2]}
+        row['age_years'] = age
+        row['days_since_update'] = days
+        yield row
@@ -1,9 +1,11 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from columnar import read_snapshot
+
 # Ler dados
-df = pd.read_csv('Resultados/github_100_repositories.csv')
+df = read_snapshot('Resultados/github_100_repositories.csv',
+                   columns=['name', 'stars', 'primary_language', 'open_issues', 'closed_issues', 'age_years'])
 
 # Configurar estilo
 plt.style.use('default')
@@ -3,8 +3,11 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 
+from columnar import read_snapshot
+
 # Ler dados dos top 1000
-df = pd.read_csv('Resultados/github_1000_repositories.csv')
+df = read_snapshot('Resultados/github_1000_repositories.csv',
+                   columns=['name', 'stars', 'primary_language', 'age_years'])
 
 # Configurar estilo
 plt.style.use('default')
@@ -1,136 +1,57 @@
-import requests
 import time
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
 
-TOKEN = ""  # Replace with your actual token
+import http_client
+from checkpoint import CollectionJournal, iter_top_repos_resumable
+from graphQl import iter_top_repos
+from repo_record import RepoRecord, load_xml
+from snapshot_store import DB_FILE, SnapshotStore
+from xml_stream import StreamingXMLWriter
 
-HEADERS = {
-    "Authorization": f"Bearer {TOKEN}",
-    "Content-Type": "application/json"
-}
-URL = "https://api.github.com/graphql"
+def write_repositories_xml(repos, output_file, store=None):
+    """Grava os pares (repo, details) no XML à medida que chegam e retorna quantos foram gravados.
 
-def run_query(query, variables=None, retries=3):
-    payload = {"query": query}
-    if variables:
-        payload["variables"] = variables
-
-    for attempt in range(retries):
-        response = requests.post(URL, json=payload, headers=HEADERS)
-        if response.status_code == 200:
-            data = response.json()
-            if "errors" in data:
-                raise Exception(f"GraphQL errors: {data['errors']}")
-            return data
-        elif response.status_code in [502, 503, 504]:
-            print(f"Erro {response.status_code}, tentando novamente ({attempt+1}/{retries})...")
-            time.sleep(5)
-        else:
-            raise Exception(f"Query failed: {response.status_code} {response.text}")
-
-    raise Exception(f"Query failed after {retries} attempts")
-
-def get_top_repo_ids(total_repos=100):
-    repos = []
-    cursor = None
-    per_page = 100
-
-    while len(repos) < total_repos:
-        query = """
-        query($cursor: String, $perPage: Int!) {
-          search(query: "stars:>1 sort:stars-desc is:public", type: REPOSITORY, first: $perPage, after: $cursor) {
-            pageInfo { endCursor hasNextPage }
-            edges {
-              node {
-                ... on Repository {
-                  name
-                  owner { login }
-                }
-              }
-            }
-          }
-        }
-        """
-        variables = {"cursor": cursor, "perPage": per_page}
-        result = run_query(query, variables)
-        search = result["data"]["search"]
-
-        for edge in search["edges"]:
-            repos.append(edge["node"])
-            if len(repos) >= total_repos:
-                break
-
-        if not search["pageInfo"]["hasNextPage"]:
-            break
-        cursor = search["pageInfo"]["endCursor"]
-
-    return repos[:total_repos]
-
-def get_repo_details(owner, name):
-    query = """
-    query($owner: String!, $name: String!) {
-      repository(owner: $owner, name: $name) {
-        stargazerCount
-        createdAt
-        updatedAt
-        primaryLanguage { name }
-        releases { totalCount }
-        issues(states: OPEN) { totalCount }
-        closedIssues: issues(states: CLOSED) { totalCount }
-        pullRequests(states: MERGED) { totalCount }
-      }
-    }
+    `repos` pode ser um gerador; como o cabeçalho é escrito antes de os dados
+    chegarem, o atributo total só é gravado quando `repos` é uma lista.
+    Com um SnapshotStore em `store`, o XML gravado é relido ao fim da coleta e
+    vira um novo snapshot, sem guardar os registros em memória.
     """
-    variables = {"owner": owner, "name": name}
-    result = run_query(query, variables)
-    return result["data"]["repository"]
-
-def collect_and_generate_xml():
-    repos = get_top_repo_ids(1000)
-    
-    # Criar elemento raiz
-    root = ET.Element("repositories")
-    root.set("total", str(len(repos)))
-    root.set("generated_at", time.strftime("%Y-%m-%d %H:%M:%S"))
-    
-    for repo in repos:
-        details = get_repo_details(repo["owner"]["login"], repo["name"])
-        primary_language = details['primaryLanguage']['name'] if details['primaryLanguage'] else 'Unknown'
-        open_issues = details['issues']['totalCount']
-        closed_issues = details['closedIssues']['totalCount']
-        total_issues = open_issues + closed_issues
-        closed_ratio = (closed_issues / total_issues) if total_issues > 0 else 0
-        
-        # Criar elemento repositório
-        repo_elem = ET.SubElement(root, "repository")
-        
-        ET.SubElement(repo_elem, "name").text = f"{repo['owner']['login']}/{repo['name']}"
-        ET.SubElement(repo_elem, "owner").text = repo['owner']['login']
-        ET.SubElement(repo_elem, "repo_name").text = repo['name']
-        ET.SubElement(repo_elem, "stars").text = str(details['stargazerCount'])
-        ET.SubElement(repo_elem, "created_at").text = details['createdAt']
-        ET.SubElement(repo_elem, "updated_at").text = details['updatedAt']
-        ET.SubElement(repo_elem, "primary_language").text = primary_language
-        ET.SubElement(repo_elem, "releases").text = str(details['releases']['totalCount'])
-        ET.SubElement(repo_elem, "open_issues").text = str(open_issues)
-        ET.SubElement(repo_elem, "closed_issues").text = str(closed_issues)
-        ET.SubElement(repo_elem, "closed_issues_ratio").text = f"{closed_ratio:.2f}"
-        ET.SubElement(repo_elem, "merged_pull_requests").text = str(details['pullRequests']['totalCount'])
-        
-        print(f"Processado: {repo['owner']['login']}/{repo['name']}")
-    
-    # Formatar XML
-    xml_str = minidom.parseString(ET.tostring(root)).toprettyxml(indent="  ")
+    attrib = {"generated_at": time.strftime("%Y-%m-%d %H:%M:%S")}
+    if isinstance(repos, list):
+        attrib = {"total": str(len(repos)), **attrib}
     
-    # Salvar arquivo
-    with open("github_repositories.xml", "w", encoding="utf-8") as f:
-        f.write(xml_str)
+    with StreamingXMLWriter(output_file, "repositories", attrib) as writer:
+        for repo, details in repos:
+            record = RepoRecord.from_details(repo, details)
+            writer.write(record.to_element())
+            print(f"Processado: {record.name}")
     
-    print(f"\nArquivo XML gerado: github_repositories.xml")
-    return root
+    print(f"\nArquivo XML gerado: {output_file}")
+    if store is not None:
+        # Gravado só depois da coleta, para não manter uma transação aberta durante as requisições
+        store.save(load_xml(output_file), source=output_file)
+    return writer.count
+
+def collect_and_generate_xml(total_repos=1000, output_file="github_repositories.xml", single_pass=True,
+                             journal_file=None, store_file=None):
+    store = SnapshotStore(store_file) if store_file else None
+    try:
+        if journal_file is None:
+            # Cada repositório é gravado assim que chega, sem acumular a coleta inteira
+            return write_repositories_xml(iter_top_repos(total_repos, single_pass), output_file, store)
+
+        # Coleta com checkpoint: o diário só é reaproveitado se a execução anterior não chegou ao XML
+        journal = CollectionJournal(journal_file)
+        repos = iter_top_repos_resumable(journal, total_repos, single_pass)
+        count = write_repositories_xml(repos, output_file, store)
+        journal.close()
+        return count
+    finally:
+        if store:
+            store.close()
 
 if __name__ == "__main__":
     start_time = time.time()
-    collect_and_generate_xml()
-    print(f"Tempo total de execução: {time.time() - start_time:.2f} segundos")
\ No newline at end of file
+    collect_and_generate_xml(journal_file="github_repositories.journal.jsonl", store_file=DB_FILE)
+    print(f"Tempo total de execução: {time.time() - start_time:.2f} segundos")
+    stats = http_client.connection_stats()
+    print(f"Requisições: {stats['requests']}, conexões abertas: {stats['connections']}, reaproveitadas: {stats['reused']}")
\ No newline at end of file
@@ -1,93 +1,252 @@
-import requests
 import time
 
-TOKEN = ""  # Replace with your actual token
+import requests
+
+import http_client
+from rate_limit import GRAPHQL_RESOURCE, RATE_LIMIT_FIELDS
+from retry_policy import breaker, retry_policy
+from search_shards import SEARCH_CAP, search_sharded
+from token_pool import TokenPool, load_tokens
+
+TOKEN = ""  # Replace with your actual token (or set GITHUB_TOKENS)
 
 HEADERS = {
-    "Authorization": f"Bearer {TOKEN}",
     "Content-Type": "application/json"
 }
-URL = "https://api.github.com/graphql"
 
-def run_query(query, variables=None, retries=3):
+# Cada requisição usa o token com mais orçamento disponível
+token_pool = TokenPool(load_tokens(TOKEN))
+
+def run_query(query, variables=None, retries=None, policy=None):
+    policy = policy or retry_policy
+    retries = retries or policy.max_attempts
     payload = {"query": query}
     if variables:
         payload["variables"] = variables
 
     for attempt in range(retries):
-        response = requests.post(URL, json=payload, headers=HEADERS)
+        breaker.wait()
+        token = token_pool.acquire(GRAPHQL_RESOURCE)
+        scheduler = token_pool.scheduler_for(token, GRAPHQL_RESOURCE)
+        scheduler.wait()
+        try:
+            response = http_client.post(f"{http_client.API_URL}/graphql", json=payload, headers={**HEADERS, "Authorization": f"Bearer {token}"})
+        except (requests.ConnectionError, requests.Timeout) as e:
+            breaker.record_failure()
+            delay = policy.delay(attempt)
+            print(f"Erro de conexão ({type(e).__name__}), tentando novamente em {delay:.1f}s ({attempt+1}/{retries})...")
+            time.sleep(delay)
+            continue
+
+        scheduler.update(response.headers)
         if response.status_code == 200:
             data = response.json()
+            if any(error.get("type") == "RATE_LIMITED" for error in data.get("errors", [])):
+                wait = scheduler.backoff(response)
+                print(f"Limite de requisições atingido, aguardando {wait:.0f}s ({attempt+1}/{retries})...")
+                continue
             if "errors" in data:
                 raise Exception(f"GraphQL errors: {data['errors']}")
+            breaker.record_success()
+            scheduler.update({}, data["data"].get("rateLimit"))
             return data
-        elif response.status_code in [502, 503, 504]:
-            print(f"Erro {response.status_code}, tentando novamente ({attempt+1}/{retries})...")
-            time.sleep(5)
+        elif scheduler.is_rate_limited(response):
+            # Limite primário ou secundário: o scheduler pausa todas as threads (Retry-After ou reset)
+            wait = scheduler.backoff(response)
+            print(f"Limite de requisições atingido, aguardando {wait:.0f}s ({attempt+1}/{retries})...")
+        elif response.status_code in policy.retry_statuses:
+            breaker.record_failure()
+            delay = policy.delay(attempt, policy.retry_after(response))
+            print(f"Erro {response.status_code}, tentando novamente em {delay:.1f}s ({attempt+1}/{retries})...")
+            time.sleep(delay)
         else:
             raise Exception(f"Query failed: {response.status_code} {response.text}")
 
     raise Exception(f"Query failed after {retries} attempts")
 
-def get_top_repo_ids(total_repos=100):
-    repos = []
-    cursor = None
-    per_page = 100
+REPO_FIELDS = """
+        stargazerCount
+        createdAt
+        updatedAt
+        pushedAt
+        primaryLanguage { name }
+        releases { totalCount }
+        issues(states: OPEN) { totalCount }
+        closedIssues: issues(states: CLOSED) { totalCount }
+        pullRequests(states: MERGED) { totalCount }
+"""
+
+SEARCH_FIELDS = """
+                  name
+                  owner { login }
+"""
+
+# Campos baratos usados para detectar repositórios alterados desde o último snapshot
+CHANGE_FIELDS = SEARCH_FIELDS + """
+                  stargazerCount
+                  updatedAt
+                  pushedAt
+"""
+
+SINGLE_PASS_PAGE_SIZE = 50
 
-    while len(repos) < total_repos:
+SEARCH_QUERY = "stars:>1 sort:stars-desc is:public"
+
+def iter_search_pages(total_repos=100, fields=SEARCH_FIELDS, per_page=100, cursor=None, search_query=SEARCH_QUERY):
+    """Gera (nodes, end_cursor, has_next) de cada página da busca por estrelas, a partir de `cursor`."""
+    collected = 0
+
+    while collected < total_repos:
         query = """
-        query($cursor: String, $perPage: Int!) {
-          search(query: "stars:>1 sort:stars-desc is:public", type: REPOSITORY, first: $perPage, after: $cursor) {
+        query($searchQuery: String!, $cursor: String, $perPage: Int!) {
+          %s
+          search(query: $searchQuery, type: REPOSITORY, first: $perPage, after: $cursor) {
             pageInfo { endCursor hasNextPage }
             edges {
               node {
-                ... on Repository {
-                  name
-                  owner { login }
-                }
+                ... on Repository {%s                }
               }
             }
           }
         }
-        """
-        variables = {"cursor": cursor, "perPage": per_page}
+        """ % (RATE_LIMIT_FIELDS, fields)
+        variables = {"searchQuery": search_query, "cursor": cursor, "perPage": min(per_page, total_repos - collected)}
         result = run_query(query, variables)
         search = result["data"]["search"]
 
-        for edge in search["edges"]:
-            repos.append(edge["node"])
-            if len(repos) >= total_repos:
-                break
+        page = [edge["node"] for edge in search["edges"]][:total_repos - collected]
+        collected += len(page)
+        yield page, search["pageInfo"]["endCursor"], search["pageInfo"]["hasNextPage"]
 
         if not search["pageInfo"]["hasNextPage"]:
             break
         cursor = search["pageInfo"]["endCursor"]
 
-    return repos[:total_repos]
+def search_repos(total_repos=100, fields=SEARCH_FIELDS, per_page=100, cursor=None, on_page=None,
+                 search_query=SEARCH_QUERY):
+    """Pagina a busca por estrelas a partir de `cursor`; on_page(nodes, end_cursor, has_next) é chamado a cada página."""
+    repos = []
+    for page, end_cursor, has_next in iter_search_pages(total_repos, fields, per_page, cursor, search_query):
+        repos.extend(page)
+        if on_page:
+            on_page(page, end_cursor, has_next)
+    return repos
+
+def count_repos(qualifiers):
+    query = """
+    query($searchQuery: String!) {
+      %s
+      search(query: $searchQuery, type: REPOSITORY, first: 1) { repositoryCount }
+    }
+    """ % RATE_LIMIT_FIELDS
+    result = run_query(query, {"searchQuery": f"{qualifiers} is:public"})
+    return result["data"]["search"]["repositoryCount"]
+
+def search_repos_sharded(total_repos, fields=SEARCH_FIELDS, per_page=100):
+    """Busca acima do limite de 1000 resultados, dividindo a busca em faixas de estrelas (search_shards.py)"""
+    if "stargazerCount" not in fields:
+        fields += "                  stargazerCount\n"
+
+    def fetch(qualifiers, limit):
+        return search_repos(limit, fields, per_page, search_query=f"{qualifiers} sort:stars-desc is:public")
+
+    return search_sharded(count_repos, fetch, lambda repo: repo["stargazerCount"],
+                          lambda repo: f"{repo['owner']['login']}/{repo['name']}", total_repos)
+
+def get_top_repo_ids(total_repos=100):
+    if total_repos > SEARCH_CAP:
+        return search_repos_sharded(total_repos)
+    return search_repos(total_repos)
+
+def get_top_repos_with_details(total_repos=100, per_page=SINGLE_PASS_PAGE_SIZE):
+    """Busca os repositórios mais populares já com todos os campos de get_repo_details, em uma única passada."""
+    if total_repos > SEARCH_CAP:
+        return search_repos_sharded(total_repos, SEARCH_FIELDS + REPO_FIELDS, per_page)
+    return search_repos(total_repos, SEARCH_FIELDS + REPO_FIELDS, per_page)
+
+def get_top_repos_summary(total_repos=100):
+    """Busca apenas estrelas, updatedAt e pushedAt dos repositórios mais populares (100 por consulta)"""
+    if total_repos > SEARCH_CAP:
+        return search_repos_sharded(total_repos, CHANGE_FIELDS)
+    return search_repos(total_repos, CHANGE_FIELDS)
+
+def iter_top_repos(total_repos=100, single_pass=True):
+    """Gera pares (repo, details) dos repositórios mais populares à medida que são coletados.
+
+    Cada página da busca é repassada assim que chega. No modo single_pass a
+    busca já traz as métricas; se a consulta combinada falhar (por exemplo, por
+    custo excessivo), a coleta continua do cursor atual com busca + detalhes em
+    lotes. Acima de SEARCH_CAP as faixas precisam ser reunidas em um ranking
+    único, então os resultados só saem depois da busca inteira.
+    """
+    if total_repos > SEARCH_CAP:
+        if single_pass:
+            try:
+                repos = get_top_repos_with_details(total_repos)
+            except Exception as e:
+                print(f"Consulta combinada falhou ({e}), usando busca em duas etapas...")
+            else:
+                yield from ((repo, repo) for repo in repos)
+                return
+        repos = get_top_repo_ids(total_repos)
+        yield from zip(repos, iter_repos_details_batch(repos))
+        return
+
+    cursor = None
+    remaining = total_repos
+    if single_pass:
+        try:
+            for page, cursor, _ in iter_search_pages(total_repos, SEARCH_FIELDS + REPO_FIELDS, SINGLE_PASS_PAGE_SIZE):
+                remaining -= len(page)
+                yield from ((repo, repo) for repo in page)
+            return
+        except Exception as e:
+            print(f"Consulta combinada falhou ({e}), continuando em duas etapas a partir da página atual...")
+
+    for page, _, _ in iter_search_pages(remaining, SEARCH_FIELDS, 100, cursor):
+        yield from zip(page, iter_repos_details_batch(page))
+
+def collect_top_repos(total_repos=100, single_pass=True):
+    """Retorna a lista de pares (repo, details) dos repositórios mais populares"""
+    return list(iter_top_repos(total_repos, single_pass))
+
+BATCH_SIZE = 50
 
 def get_repo_details(owner, name):
     query = """
     query($owner: String!, $name: String!) {
-      repository(owner: $owner, name: $name) {
-        stargazerCount
-        createdAt
-        updatedAt
-        primaryLanguage { name }
-        releases { totalCount }
-        issues(states: OPEN) { totalCount }
-        closedIssues: issues(states: CLOSED) { totalCount }
-        pullRequests(states: MERGED) { totalCount }
-      }
+      %s
+      repository(owner: $owner, name: $name) {%s      }
     }
-    """
+    """ % (RATE_LIMIT_FIELDS, REPO_FIELDS)
     variables = {"owner": owner, "name": name}
     result = run_query(query, variables)
     return result["data"]["repository"]
 
+def iter_repos_details_batch(repos, batch_size=BATCH_SIZE):
+    """Gera os detalhes de cada repositório, consultando até batch_size por vez com aliases (r0, r1, ...)."""
+    for start in range(0, len(repos), batch_size):
+        batch = repos[start:start + batch_size]
+        params = []
+        fields = []
+        variables = {}
+        for i, repo in enumerate(batch):
+            params.append(f"$owner{i}: String!, $name{i}: String!")
+            fields.append(f"r{i}: repository(owner: $owner{i}, name: $name{i}) {{{REPO_FIELDS}}}")
+            variables[f"owner{i}"] = repo["owner"]["login"]
+            variables[f"name{i}"] = repo["name"]
+
+        fields.append(RATE_LIMIT_FIELDS)
+        query = "query(%s) {\n%s\n}" % (", ".join(params), "\n".join(fields))
+        result = run_query(query, variables)
+        yield from (result["data"][f"r{i}"] for i in range(len(batch)))
+
+def get_repos_details_batch(repos, batch_size=BATCH_SIZE):
+    """Busca os detalhes de vários repositórios em uma única consulta, usando aliases (r0, r1, ...)."""
+    return list(iter_repos_details_batch(repos, batch_size))
+
 def collect_and_print_repo_data():
-    repos = get_top_repo_ids(100)
-    for repo in repos:
-        details = get_repo_details(repo["owner"]["login"], repo["name"])
+    for repo, details in collect_top_repos(100):
         primary_language = details['primaryLanguage']['name'] if details['primaryLanguage'] else 'Unknown'
         open_issues = details['issues']['totalCount']
         closed_issues = details['closedIssues']['totalCount']
@@ -110,3 +269,5 @@ if __name__ == "__main__":
     start_time = time.time()
     collect_and_print_repo_data()
     print(f"Tempo total de execução: {time.time() - start_time:.2f} segundos")
+    stats = http_client.connection_stats()
+    print(f"Requisições: {stats['requests']}, conexões abertas: {stats['connections']}, reaproveitadas: {stats['reused']}")
@@ -0,0 +1,80 @@
+import hashlib
+import json
+import os
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+import http_client
+
+CACHE_DIR = ".http_cache"
+
+# Cabeçalhos guardados junto com o corpo (Link é necessário para a paginação)
+STORED_HEADERS = ["Content-Type", "ETag", "Last-Modified", "Link"]
+
+class ConditionalCache:
+    """Cache em disco de respostas GET usando ETag / Last-Modified.
+
+    Cada resposta 200 com validador é salva; nas próximas execuções a requisição
+    é enviada com If-None-Match / If-Modified-Since e um 304 (que não consome rate
+    limit no GitHub) é respondido com o corpo salvo.
+    """
+
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _load(self, url):
+        try:
+            with open(self._path(url), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _store(self, url, response):
+        entry = {
+            "url": url,
+            "headers": {name: response.headers[name] for name in STORED_HEADERS if name in response.headers},
+            "body": response.text
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(url)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    def _cached_response(self, entry, not_modified):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = entry["url"]
+        response.encoding = "utf-8"
+        response._content = entry["body"].encode("utf-8")
+        response.headers = CaseInsensitiveDict(not_modified.headers)
+        response.headers.update(entry["headers"])
+        response.headers.pop("Content-Length", None)
+        response.headers.pop("Content-Encoding", None)
+        return response
+
+    def get(self, url, headers=None, **kwargs):
+        entry = self._load(url)
+        headers = dict(headers or {})
+        if entry:
+            if "ETag" in entry["headers"]:
+                headers["If-None-Match"] = entry["headers"]["ETag"]
+            if "Last-Modified" in entry["headers"]:
+                headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+
+        response = http_client.get(url, headers=headers, **kwargs)
+        if response.status_code == 304 and entry:
+            self.hits += 1
+            return self._cached_response(entry, response)
+
+        self.misses += 1
+        if response.status_code == 200 and ("ETag" in response.headers or "Last-Modified" in response.headers):
+            self._store(url, response)
+        return response
\ No newline at end of file
@@ -0,0 +1,135 @@
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Quantidade de hosts com pool próprio e conexões mantidas por host
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 32
+TIMEOUT = 60
+
+# Endereço base da API; aponte para o servidor de api_replay.py para rodar offline
+API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+
+# Cabeçalhos de resposta guardados nas gravações (cassettes)
+RECORDED_HEADERS = ["Content-Type", "ETag", "Last-Modified", "Link", "Retry-After",
+                    "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset", "X-RateLimit-Used"]
+
+DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive"
+}
+
+_session = None
+_timeout = TIMEOUT
+_request_count = 0
+_bytes_received = 0
+_latencies = []
+_lock = threading.Lock()
+_cassette = None
+
+def configure(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, timeout=TIMEOUT, headers=None):
+    """(Re)cria a sessão HTTP compartilhada por todos os coletores"""
+    global _session, _timeout, _request_count, _bytes_received, _latencies
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    if headers:
+        session.headers.update(headers)
+
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = session
+        _timeout = timeout
+        _request_count = 0
+        _bytes_received = 0
+        _latencies = []
+    return session
+
+def get_session():
+    if _session is None:
+        configure()
+    return _session
+
+def request(method, url, **kwargs):
+    """Envia uma requisição pela sessão compartilhada, reaproveitando conexões keep-alive"""
+    global _request_count, _bytes_received
+    session = get_session()
+    kwargs.setdefault("timeout", _timeout)
+    with _lock:
+        _request_count += 1
+    start = time.perf_counter()
+    response = session.request(method, url, **kwargs)
+    elapsed = time.perf_counter() - start
+    # Tamanho transferido (comprimido, quando o servidor informa Content-Length)
+    size = int(response.headers.get("Content-Length") or len(response.content))
+    with _lock:
+        _bytes_received += size
+        _latencies.append(elapsed)
+    if _cassette is not None:
+        _record(method, url, kwargs.get("json"), response)
+    return response
+
+def transfer_stats():
+    """Retorna requisições, bytes recebidos e latências p50/p95 (segundos) desde o último configure()"""
+    with _lock:
+        latencies = sorted(_latencies)
+    def percentile(q):
+        return latencies[min(int(q * len(latencies)), len(latencies) - 1)] if latencies else 0.0
+    return {
+        "requests": _request_count,
+        "bytes": _bytes_received,
+        "p50": percentile(0.50),
+        "p95": percentile(0.95)
+    }
+
+def start_recording(path):
+    """Passa a gravar todas as trocas HTTP em `path` (JSON Lines), para reprodução com api_replay.py"""
+    global _cassette
+    _cassette = path
+
+def stop_recording():
+    global _cassette
+    _cassette = None
+
+def _record(method, url, body, response):
+    entry = {
+        "method": method,
+        "path": url[len(API_URL):] if url.startswith(API_URL) else url,
+        "body": body,
+        "status": response.status_code,
+        "headers": {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers},
+        "response": response.text
+    }
+    with _lock:
+        with open(_cassette, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+def connection_stats():
+    """Retorna quantas requisições foram feitas e quantas conexões TCP/TLS foram abertas"""
+    connections = 0
+    if _session is not None:
+        for adapter in set(_session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                connections += pools[key].num_connections
+    return {
+        "requests": _request_count,
+        "connections": connections,
+        "reused": max(_request_count - connections, 0)
+    }
+
+if os.environ.get("GITHUB_API_RECORD"):
+    start_recording(os.environ["GITHUB_API_RECORD"])
\ No newline at end of file
@@ -0,0 +1,52 @@
+import sys
+import time
+
+import http_client
+from generate_xml import write_repositories_xml
+from graphQl import get_repos_details_batch, get_top_repos_summary
+from repo_record import load_xml
+
+def load_snapshot(xml_file):
+    """Lê um XML gerado anteriormente e retorna {owner/nome: RepoRecord}"""
+    return {record.name: record for record in load_xml(xml_file)}
+
+def has_changed(summary, record):
+    if record.stars != summary['stargazerCount'] or record.updated_at != summary['updatedAt']:
+        return True
+    # Snapshots antigos não têm pushed_at; nesse caso estrelas e updatedAt decidem
+    return record.pushed_at is not None and record.pushed_at != summary['pushedAt']
+
+def refresh_top_repos(snapshot, total_repos=1000):
+    """Retorna pares (repo, details) consultando detalhes só de repositórios novos ou alterados"""
+    summaries = get_top_repos_summary(total_repos)
+    changed = []
+    for repo in summaries:
+        record = snapshot.get(f"{repo['owner']['login']}/{repo['name']}")
+        if record is None or has_changed(repo, record):
+            changed.append(repo)
+
+    print(f"{len(changed)} de {len(summaries)} repositórios novos ou alterados desde o último snapshot")
+    fetched = {id(repo): details for repo, details in zip(changed, get_repos_details_batch(changed))}
+
+    repos = []
+    for repo in summaries:
+        if id(repo) in fetched:
+            repos.append((repo, fetched[id(repo)]))
+        else:
+            repos.append((repo, snapshot[f"{repo['owner']['login']}/{repo['name']}"].to_details()))
+    return repos
+
+def refresh_xml(snapshot_file, output_file, total_repos=1000):
+    """Atualização incremental: gera `output_file` a partir de `snapshot_file` e da busca atual"""
+    repos = refresh_top_repos(load_snapshot(snapshot_file), total_repos)
+    return write_repositories_xml(repos, output_file)
+
+if __name__ == "__main__":
+    # Ex.: python incremental.py Resultados/top_1000_repositories.xml top_1000_repositories.xml 1000
+    snapshot_file, output_file = sys.argv[1], sys.argv[2]
+    total_repos = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    start_time = time.time()
+    refresh_xml(snapshot_file, output_file, total_repos)
+    print(f"Tempo total de execução: {time.time() - start_time:.2f} segundos")
+    stats = http_client.connection_stats()
+    print(f"Requisições: {stats['requests']}, conexões abertas: {stats['connections']}, reaproveitadas: {stats['reused']}")
\ No newline at end of file
@@ -0,0 +1,124 @@
+import math
+import random
+import statistics
+
+# Tamanho padrão do sketch: erro de rank em torno de 1% com essa configuração
+DEFAULT_K = 200
+# Fator de redução da capacidade entre níveis (valor usual do KLL)
+CAPACITY_DECAY = 2 / 3
+# Capacidade mínima de cada nível, para não compactar a cada inserção
+MIN_CAPACITY = 8
+
+class KLLSketch:
+    """Sketch KLL para medianas e quantis com memória limitada e mergeável.
+
+    Guarda no máximo O(k) valores, independentemente de quantos são
+    inseridos; o erro de rank dos quantis é de aproximadamente 2/k (k=200 →
+    ~1%). Sketches de shards diferentes podem ser combinados com merge().
+    Enquanto nenhum nível foi compactado, os valores estão todos guardados e
+    os resultados são exatos (inclusive a mediana de statistics.median).
+    """
+
+    def __init__(self, k=DEFAULT_K, seed=None):
+        self.k = k
+        self.random = random.Random(seed)
+        self.compactors = [[]]
+        self.count = 0
+        self.min = None
+        self.max = None
+        self._size = 0
+        self._max_size = self._capacity(0)
+
+    @classmethod
+    def for_error(cls, epsilon, seed=None):
+        """Sketch dimensionado para um erro de rank aproximado de `epsilon` (ex.: 0.01)"""
+        return cls(max(8, math.ceil(2 / epsilon)), seed)
+
+    def _capacity(self, level):
+        height = len(self.compactors) - level - 1
+        return max(MIN_CAPACITY, int(math.ceil(CAPACITY_DECAY ** height * self.k)) + 1)
+
+    def _grow(self):
+        self.compactors.append([])
+        self._max_size = sum(self._capacity(level) for level in range(len(self.compactors)))
+
+    def update(self, value):
+        self.compactors[0].append(value)
+        self.count += 1
+        self._size += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if self._size >= self._max_size:
+            self._compress()
+
+    def extend(self, values):
+        values = list(values)
+        if not values:
+            return
+        low, high = min(values), max(values)
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+        self.count += len(values)
+        for value in values:
+            self.compactors[0].append(value)
+            self._size += 1
+            if self._size >= self._max_size:
+                self._compress()
+
+    def _compress(self):
+        for level in range(len(self.compactors)):
+            compactor = self.compactors[level]
+            if len(compactor) < self._capacity(level):
+                continue
+            if level + 1 == len(self.compactors):
+                self._grow()
+            # Metade dos valores (ordenados, com deslocamento aleatório) sobe de nível com peso dobrado
+            leftover = [compactor.pop()] if len(compactor) % 2 else []
+            compactor.sort()
+            self.compactors[level + 1].extend(compactor[self.random.randint(0, 1)::2])
+            self.compactors[level] = leftover
+            self._size = sum(len(c) for c in self.compactors)
+            if self._size < self._max_size:
+                break
+
+    def merge(self, other):
+        """Incorpora outro sketch (por exemplo, de outro shard ou snapshot)"""
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for level, compactor in enumerate(other.compactors):
+            self.compactors[level].extend(compactor)
+        self.count += other.count
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        self._size = sum(len(c) for c in self.compactors)
+        while self._size >= self._max_size:
+            self._compress()
+        return self
+
+    def _exact(self):
+        return all(not compactor for compactor in self.compactors[1:])
+
+    def quantile(self, q):
+        """Valor aproximado no quantil q (0 <= q <= 1)"""
+        if not self.count:
+            raise ValueError("quantil de um sketch vazio")
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        weighted = sorted((value, 2 ** level) for level, compactor in enumerate(self.compactors) for value in compactor)
+        target = q * sum(weight for _, weight in weighted)
+        cumulative = 0
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return value
+        return self.max
+
+    def median(self):
+        if self._exact():
+            return statistics.median(self.compactors[0])
+        return self.quantile(0.5)
@@ -0,0 +1,119 @@
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+# Fração do limite abaixo da qual as requisições passam a ser espaçadas
+PACE_THRESHOLD = 0.5
+# Reserva de pontos que nunca é consumida, para não bater no limite
+MIN_REMAINING = 50
+# Fração máxima do limite reservada: a busca tem só 30 requisições por minuto
+MAX_RESERVE_FRACTION = 0.1
+# Espera padrão para limites secundários sem Retry-After
+SECONDARY_LIMIT_WAIT = 60
+
+RATE_LIMIT_FIELDS = "rateLimit { cost remaining resetAt }"
+
+# O GitHub mantém orçamentos separados por recurso (X-RateLimit-Resource):
+# core (5000/h), search (30/min), graphql (5000 pontos/h), ...
+CORE_RESOURCE = "core"
+GRAPHQL_RESOURCE = "graphql"
+
+def resource_for(url):
+    """Recurso de rate limit usado por uma URL da API"""
+    path = urlparse(url).path
+    if path.endswith("/graphql"):
+        return GRAPHQL_RESOURCE
+    if "/search/code" in path:
+        return "code_search"
+    if "/search/" in path:
+        return "search"
+    return CORE_RESOURCE
+
+class RateLimitScheduler:
+    """Controla o ritmo das requisições com base no orçamento de rate limit do GitHub.
+
+    Lê os cabeçalhos X-RateLimit-*, Retry-After e o objeto rateLimit das respostas
+    GraphQL. Enquanto há folga no orçamento as requisições seguem sem espera; abaixo
+    de PACE_THRESHOLD, o restante é distribuído até o reset, e com o orçamento
+    esgotado (ou um 403/429 de limite) todas as threads aguardam juntas.
+    """
+
+    def __init__(self, pace_threshold=PACE_THRESHOLD, min_remaining=MIN_REMAINING):
+        self.pace_threshold = pace_threshold
+        self.min_remaining = min_remaining
+        self.limit = None
+        self.remaining = None
+        self.reset_at = None
+        self.last_cost = 1
+        self.total_cost = 0
+        self.paused_until = 0.0
+        self.next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Bloqueia até ser seguro enviar a próxima requisição"""
+        with self._lock:
+            now = time.time()
+            start = max(now, self.paused_until, self.next_slot)
+            if self._exhausted(start):
+                # Orçamento esgotado: espera o reset da janela
+                start = self.reset_at
+            self.next_slot = start + self._interval(start)
+        if start > now:
+            time.sleep(start - now)
+
+    def _reserve(self):
+        """Reserva proporcional ao limite do recurso (ex.: 50 no core, 3 na busca de 30/min)"""
+        if self.limit:
+            return min(self.min_remaining, int(self.limit * MAX_RESERVE_FRACTION))
+        return self.min_remaining
+
+    def _exhausted(self, now):
+        return (self.remaining is not None and self.reset_at is not None
+                and self.reset_at > now and self.remaining <= self._reserve())
+
+    def _interval(self, now):
+        if self.remaining is None or self.reset_at is None or self.reset_at <= now:
+            return 0.0
+        if self.limit and self.remaining > self.limit * self.pace_threshold:
+            return 0.0
+        requests_left = (self.remaining - self._reserve()) / max(self.last_cost, 1)
+        return (self.reset_at - now) / max(requests_left, 1)
+
+    def update(self, headers, rate_limit=None):
+        """Atualiza o orçamento a partir dos cabeçalhos e do objeto rateLimit da resposta"""
+        with self._lock:
+            if "X-RateLimit-Limit" in headers:
+                self.limit = int(headers["X-RateLimit-Limit"])
+            if "X-RateLimit-Remaining" in headers:
+                self.remaining = int(headers["X-RateLimit-Remaining"])
+            if "X-RateLimit-Reset" in headers:
+                self.reset_at = float(headers["X-RateLimit-Reset"])
+            if rate_limit:
+                self.last_cost = rate_limit["cost"]
+                self.total_cost += rate_limit["cost"]
+                self.remaining = rate_limit["remaining"]
+                reset = datetime.fromisoformat(rate_limit["resetAt"].replace('Z', '+00:00'))
+                self.reset_at = reset.timestamp()
+
+    def is_rate_limited(self, response):
+        """Indica se uma resposta 403/429 é de limite primário ou secundário"""
+        if response.status_code not in (403, 429):
+            return False
+        return ("Retry-After" in response.headers
+                or response.headers.get("X-RateLimit-Remaining") == "0"
+                or "rate limit" in response.text.lower())
+
+    def backoff(self, response):
+        """Pausa todas as requisições conforme Retry-After ou o reset do limite; retorna a espera em segundos"""
+        now = time.time()
+        if "Retry-After" in response.headers:
+            until = now + float(response.headers["Retry-After"])
+        elif response.headers.get("X-RateLimit-Remaining") == "0" and "X-RateLimit-Reset" in response.headers:
+            until = float(response.headers["X-RateLimit-Reset"])
+        else:
+            until = now + SECONDARY_LIMIT_WAIT
+        with self._lock:
+            self.paused_until = max(self.paused_until, until)
+        return max(until - now, 0.0)
\ No newline at end of file
@@ -0,0 +1,136 @@
+import csv
+import xml.etree.ElementTree as ET
+from datetime import timezone
+
+# Campos de <repository> e seus conversores; a ordem é a das colunas do XML e do CSV
+FIELDS = {
+    'name': str,
+    'owner': str,
+    'repo_name': str,
+    'stars': int,
+    'created_at': str,
+    'updated_at': str,
+    'pushed_at': str,
+    'primary_language': str,
+    'releases': int,
+    'open_issues': int,
+    'closed_issues': int,
+    'closed_issues_ratio': float,
+    'merged_pull_requests': int,
+}
+
+CSV_FIELDS = [field for field in FIELDS if field != 'pushed_at'] + ['age_years', 'days_since_update']
+
+class RepoRecord:
+    """Registro de um repositório, compartilhado por coletores, conversores e análises.
+
+    Usa __slots__ em vez de um dict por repositório: cada registro ocupa uma
+    fração da memória, o que importa em snapshots com centenas de milhares de
+    repositórios. Campos ausentes na origem ficam como None.
+    """
+
+    __slots__ = tuple(FIELDS)
+
+    def __init__(self, **fields):
+        for name in FIELDS:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_details(cls, repo, details):
+        """Cria o registro a partir de um par (repo, details) da API GraphQL"""
+        open_issues = details['issues']['totalCount']
+        closed_issues = details['closedIssues']['totalCount']
+        total_issues = open_issues + closed_issues
+        closed_ratio = (closed_issues / total_issues) if total_issues > 0 else 0
+        return cls(
+            name=f"{repo['owner']['login']}/{repo['name']}",
+            owner=repo['owner']['login'],
+            repo_name=repo['name'],
+            stars=details['stargazerCount'],
+            created_at=details['createdAt'],
+            updated_at=details['updatedAt'],
+            pushed_at=details.get('pushedAt'),
+            primary_language=details['primaryLanguage']['name'] if details['primaryLanguage'] else 'Unknown',
+            releases=details['releases']['totalCount'],
+            open_issues=open_issues,
+            closed_issues=closed_issues,
+            closed_issues_ratio=round(closed_ratio, 2),
+            merged_pull_requests=details['pullRequests']['totalCount'],
+        )
+
+    def to_details(self):
+        """Converte de volta para o formato de get_repo_details (usado pela atualização incremental)"""
+        return {
+            'stargazerCount': self.stars,
+            'createdAt': self.created_at,
+            'updatedAt': self.updated_at,
+            'pushedAt': self.pushed_at,
+            'primaryLanguage': {'name': self.primary_language} if self.primary_language != 'Unknown' else None,
+            'releases': {'totalCount': self.releases},
+            'issues': {'totalCount': self.open_issues},
+            'closedIssues': {'totalCount': self.closed_issues},
+            'pullRequests': {'totalCount': self.merged_pull_requests}
+        }
+
+    def to_element(self):
+        """Monta o elemento <repository> do XML"""
+        repo_elem = ET.Element("repository")
+        for name in FIELDS:
+            value = getattr(self, name)
+            if value is None:
+                continue
+            text = f"{value:.2f}" if name == 'closed_issues_ratio' else str(value)
+            ET.SubElement(repo_elem, name).text = text
+        return repo_elem
+
+def load_xml(xml_file):
+    """Lê o XML com iterparse e gera um RepoRecord por <repository>.
+
+    Cada elemento é descartado logo após ser lido, então a memória usada não
+    depende do número de repositórios no arquivo.
+    """
+    context = ET.iterparse(xml_file, events=("start", "end"))
+    _, root = next(context)
+    for event, elem in context:
+        if event != "end" or elem.tag != "repository":
+            continue
+        fields = {}
+        for child in elem:
+            convert = FIELDS.get(child.tag)
+            if convert:
+                fields[child.tag] = convert(child.text)
+        yield RepoRecord(**fields)
+        root.clear()
+
+def load_csv(csv_file):
+    """Gera um RepoRecord por linha de um CSV gerado por xml_to_csv"""
+    with open(csv_file, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield RepoRecord(**{name: FIELDS[name](value) for name, value in row.items() if name in FIELDS})
+
+def load_parquet(parquet_file, columns=None, batch_size=50000):
+    """Gera um RepoRecord por linha do snapshot Parquet, lendo só as colunas pedidas"""
+    import pyarrow.parquet as pq
+
+    for batch in pq.ParquetFile(parquet_file).iter_batches(batch_size=batch_size, columns=columns):
+        for row in batch.to_pylist():
+            for name in ('created_at', 'updated_at'):
+                if row.get(name) is not None:
+                    row[name] = row[name].astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+            yield RepoRecord(**row)
+
+def _load_latest_snapshot(store):
+    with store:
+        yield from store.load()
+
+def load_repositories(path, columns=None):
+    """Carrega registros de um snapshot em XML, CSV, Parquet ou SQLite (o mais recente), conforme a extensão"""
+    if path.endswith('.sqlite'):
+        from snapshot_store import SnapshotStore
+
+        return _load_latest_snapshot(SnapshotStore(path))
+    if path.endswith('.parquet'):
+        return load_parquet(path, columns)
+    if path.endswith('.csv'):
+        return load_csv(path)
+    return load_xml(path)
@@ -0,0 +1,139 @@
+import statistics
+from collections import Counter
+
+from derived_metrics import CHUNK_SIZE, derive, reference_time
+from quantile_sketch import KLLSketch
+
+# Séries numéricas das questões de pesquisa (RQ01-RQ04 e RQ06)
+SERIES = ['age_years', 'merged_pull_requests', 'releases', 'days_since_update', 'closed_issues_ratio']
+
+class ExactSeries:
+    """Guarda todos os valores da série; mesma interface do KLLSketch, com resultados exatos"""
+
+    def __init__(self):
+        self.values = []
+
+    @property
+    def count(self):
+        return len(self.values)
+
+    @property
+    def min(self):
+        return min(self.values)
+
+    @property
+    def max(self):
+        return max(self.values)
+
+    def extend(self, values):
+        self.values.extend(values)
+
+    def merge(self, other):
+        self.values.extend(other.values)
+        return self
+
+    def median(self):
+        return statistics.median(self.values)
+
+    def quantile(self, q):
+        values = sorted(self.values)
+        return values[min(int(q * len(values)), len(values) - 1)]
+
+class RepositoryMetrics:
+    """Estatísticas das RQs calculadas em uma única passada pelos registros.
+
+    `repositories` pode ser qualquer iterável de RepoRecord (inclusive um
+    gerador dos leitores de XML/CSV/Parquet/SQLite); os registros são
+    processados em blocos e descartados. Com `sketch_k`, cada série vira um
+    KLLSketch e a memória fica constante, com medianas aproximadas; sem ele,
+    as séries são guardadas e os resultados são exatos. Medianas, mínimos e
+    máximos são calculados uma vez e reaproveitados pela saída no console e
+    pelo relatório.
+    """
+
+    def __init__(self, repositories=(), now=None, sketch_k=None, chunk_size=CHUNK_SIZE):
+        self.now = reference_time() if now is None else now
+        self.sketch_k = sketch_k
+        self.series = {name: KLLSketch(sketch_k) if sketch_k else ExactSeries() for name in SERIES}
+        self.language_counts = Counter()
+        self.total = 0
+        self.no_issues = 0
+        self.no_releases = 0
+        self.no_prs = 0
+        self._summaries = {}
+
+        chunk = []
+        for repo in repositories:
+            chunk.append(repo)
+            if len(chunk) >= chunk_size:
+                self._add_chunk(chunk)
+                chunk = []
+        self._add_chunk(chunk)
+
+    def _add_chunk(self, repositories):
+        if not repositories:
+            return
+        self.total += len(repositories)
+        open_issues = [repo.open_issues for repo in repositories]
+        closed_issues = [repo.closed_issues for repo in repositories]
+        pull_requests = [repo.merged_pull_requests for repo in repositories]
+        releases = [repo.releases for repo in repositories]
+
+        derived = derive(
+            [repo.created_at for repo in repositories],
+            [repo.updated_at for repo in repositories],
+            open_issues, closed_issues, self.now,
+        )
+        self.series['age_years'].extend(derived['age_years'].tolist())
+        self.series['days_since_update'].extend(derived['days_since_update'].tolist())
+        # RQ06 considera apenas repositórios com alguma issue fechada
+        self.series['closed_issues_ratio'].extend(ratio for ratio in derived['closed_issues_ratio'].tolist() if ratio > 0)
+        self.series['merged_pull_requests'].extend(pull_requests)
+        self.series['releases'].extend(releases)
+
+        self.language_counts.update(repo.primary_language for repo in repositories)
+        self.no_issues += sum(opened + closed == 0 for opened, closed in zip(open_issues, closed_issues))
+        self.no_releases += releases.count(0)
+        self.no_prs += pull_requests.count(0)
+
+    def merge(self, other):
+        """Incorpora as métricas de outro shard ou snapshot (os dois no mesmo modo)"""
+        for name in SERIES:
+            self.series[name].merge(other.series[name])
+        self.language_counts.update(other.language_counts)
+        self.total += other.total
+        self.no_issues += other.no_issues
+        self.no_releases += other.no_releases
+        self.no_prs += other.no_prs
+        self._summaries = {}
+        return self
+
+    def summary(self, name):
+        """{'median', 'min', 'max'} da série `name`, calculado na primeira chamada"""
+        if name not in self._summaries:
+            series = self.series[name]
+            self._summaries[name] = {
+                'median': series.median(),
+                'min': series.min,
+                'max': series.max,
+            }
+        return self._summaries[name]
+
+    def median(self, name):
+        return self.summary(name)['median']
+
+    def minimum(self, name):
+        return self.summary(name)['min']
+
+    def maximum(self, name):
+        return self.summary(name)['max']
+
+    def quantile(self, name, q):
+        return self.series[name].quantile(q)
+
+    def top_languages(self, k):
+        """[(linguagem, repositórios, percentual)] das k linguagens mais frequentes"""
+        return [(lang, count, count / self.total * 100) for lang, count in self.language_counts.most_common(k)]
+
+    def percentage(self, count):
+        return count / self.total * 100
@@ -1,17 +1,65 @@
-import requests
+import http_client
 import time
-
-token = "PERSONAL_TOKEN"  # Replace with your actual token
+from functools import lru_cache
+from urllib.parse import parse_qs, urlparse
+from http_cache import ConditionalCache
+from rate_limit import resource_for
+from search_shards import SEARCH_CAP, search_sharded
+from token_pool import TokenPool, load_tokens
+
+token = "PERSONAL_TOKEN"  # Replace with your actual token (or set GITHUB_TOKENS)
+
+# Cada requisição usa o token com mais orçamento disponível
+token_pool = TokenPool(load_tokens(token))
+
+# Cache de respostas com ETag/Last-Modified; None desativa as requisições condicionais
+cache = ConditionalCache()
+
+def _get(url):
+    # Busca (30/min) e core (5000/h) têm orçamentos separados no GitHub
+    resource = resource_for(url)
+    selected = token_pool.acquire(resource)
+    scheduler = token_pool.scheduler_for(selected, resource)
+    scheduler.wait()
+    headers = {"Authorization": f"Bearer {selected}"}
+    if cache is None:
+        response = http_client.get(url, headers=headers)
+    else:
+        response = cache.get(url, headers=headers)
+    # O cabeçalho X-RateLimit-Resource, quando presente, indica qual orçamento foi consumido
+    token_pool.scheduler_for(selected, response.headers.get("X-RateLimit-Resource", resource)).update(response.headers)
+    return response
+
+def count_repositories(keyword):
+    url = f"{http_client.API_URL}/search/repositories?q={keyword}&per_page=1"
+    response = _get(url)
+    if response.status_code == 200:
+        return response.json()["total_count"]
+    else:
+        raise Exception(f"Error: {response.status_code}")
 
 def get_popular_repositories(keyword, total_repos=100):
+    """Busca os repositórios mais populares; acima de SEARCH_CAP a busca é dividida em faixas de estrelas.
+
+    As faixas substituem o qualificador stars: da palavra-chave; os demais termos
+    (ex.: language:python) são mantidos em todas as consultas de contagem e de busca.
+    """
+    if total_repos > SEARCH_CAP:
+        extra = " ".join(term for term in keyword.split() if not term.startswith("stars:"))
+        with_keyword = lambda qualifiers: f"{qualifiers} {extra}" if extra else qualifiers
+        return search_sharded(lambda qualifiers: count_repositories(with_keyword(qualifiers)),
+                              lambda qualifiers, limit: _search_repositories(with_keyword(qualifiers), limit),
+                              lambda repo: repo["stargazers_count"], lambda repo: repo["full_name"], total_repos)
+    return _search_repositories(keyword, total_repos)
+
+def _search_repositories(keyword, total_repos):
     repos = []
     page = 1
     per_page = 100
     
     while len(repos) < total_repos:
-        url = f"https://api.github.com/search/repositories?q={keyword}&sort=stars&order=desc&page={page}&per_page={per_page}"
-        headers = {"Authorization": f"Bearer {token}"}
-        response = requests.get(url, headers=headers)
+        url = f"{http_client.API_URL}/search/repositories?q={keyword}&sort=stars&order=desc&page={page}&per_page={min(per_page, total_repos)}"
+        response = _get(url)
         if response.status_code == 200:
             items = response.json()["items"]
             if not items:
@@ -25,47 +73,73 @@ def get_popular_repositories(keyword, total_repos=100):
     return repos[:total_repos]
 
 
-def get_repository_details(owner, repo):
-    url = f"https://api.github.com/repos/{owner}/{repo}"
-    headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(url, headers=headers)
+# Quantos objetos /repos/{owner}/{repo} ficam em memória durante a execução
+REPO_CACHE_SIZE = 256
+
+@lru_cache(maxsize=REPO_CACHE_SIZE)
+def _fetch_repository(owner, repo):
+    """Busca /repos/{owner}/{repo} uma única vez por execução (LRU com REPO_CACHE_SIZE entradas)"""
+    url = f"{http_client.API_URL}/repos/{owner}/{repo}"
+    response = _get(url)
     if response.status_code == 200:
         return response.json()
     else:
         raise Exception(f"Error: {response.status_code}")
 
+def get_repository_details(owner, repo):
+    return _fetch_repository(owner, repo)
+
+
+def get_pull_requests(owner, repo, validate=False):
+    """Conta as pull requests mescladas.
+
+    Por padrão usa o total_count da busca `is:pr is:merged` (uma requisição).
+    Com validate=True percorre todas as PRs fechadas e conta as que têm merged_at.
+    """
+    if not validate:
+        url = f"{http_client.API_URL}/search/issues?q=repo:{owner}/{repo}+is:pr+is:merged&per_page=1"
+        response = _get(url)
+        if response.status_code == 200:
+            return response.json()["total_count"]
+        else:
+            raise Exception(f"Error: {response.status_code}")
 
-def get_pull_requests(owner, repo):
-    url = f"https://api.github.com/repos/{owner}/{repo}/pulls?state=closed"
-    headers = {"Authorization": f"Bearer {token}"}
+    url = f"{http_client.API_URL}/repos/{owner}/{repo}/pulls?state=closed"
     page = 1
     merged_count = 0
     while True:
-        response = requests.get(f"{url}&page={page}&per_page=100", headers=headers)
+        response = _get(f"{url}&page={page}&per_page=100")
         if response.status_code == 200:
             pull_requests = response.json()
             if not pull_requests:
                 break
-            for pr in pull_requests:
-                # Buscar detalhes do PR para verificar se foi mesclado
-                pr_url = pr["url"]
-                pr_response = requests.get(pr_url, headers=headers)
-                if pr_response.status_code == 200:
-                    pr_details = pr_response.json()
-                    if pr_details.get("merged_at"):
-                        merged_count += 1
+            # A listagem já traz merged_at, sem precisar buscar cada PR
+            merged_count += sum(1 for pr in pull_requests if pr.get("merged_at"))
             page += 1
         else:
             raise Exception(f"Error: {response.status_code}")
     return merged_count
 
-def get_releases(owner, repo):
-    url = f"https://api.github.com/repos/{owner}/{repo}/releases"
-    headers = {"Authorization": f"Bearer {token}"}
+def _count_items(url):
+    """Conta os itens de uma listagem com uma requisição: per_page=1 e a página rel="last" do cabeçalho Link"""
+    separator = "&" if "?" in url else "?"
+    response = _get(f"{url}{separator}per_page=1")
+    if response.status_code != 200:
+        raise Exception(f"Error: {response.status_code}")
+    last = response.links.get("last")
+    if last:
+        return int(parse_qs(urlparse(last["url"]).query)["page"][0])
+    # Sem Link: a listagem cabe em uma página
+    return len(response.json())
+
+def get_releases(owner, repo, count_only=True):
+    url = f"{http_client.API_URL}/repos/{owner}/{repo}/releases"
+    if count_only:
+        return _count_items(url)
     page = 1
     releases = []
     while True:
-        response = requests.get(f"{url}?page={page}&per_page=100", headers=headers)
+        response = _get(f"{url}?page={page}&per_page=100")
         if response.status_code == 200:
             page_releases = response.json()
             if not page_releases:
@@ -76,13 +150,14 @@ def get_releases(owner, repo):
             raise Exception(f"Error: {response.status_code}")
     return len(releases)
 
-def get_issues(owner, repo):
-    url = f"https://api.github.com/repos/{owner}/{repo}/issues?state=open"
-    headers = {"Authorization": f"Bearer {token}"}
+def get_issues(owner, repo, count_only=True):
+    url = f"{http_client.API_URL}/repos/{owner}/{repo}/issues?state=open"
+    if count_only:
+        return _count_items(url)
     page = 1
     issues = []
     while True:
-        response = requests.get(f"{url}&page={page}&per_page=100", headers=headers)
+        response = _get(f"{url}&page={page}&per_page=100")
         if response.status_code == 200:
             page_issues = response.json()
             if not page_issues:
@@ -93,13 +168,14 @@ def get_issues(owner, repo):
             raise Exception(f"Error: {response.status_code}")
     return len(issues)
 
-def get_clossed_issues(owner, repo):
-    url = f"https://api.github.com/repos/{owner}/{repo}/issues?state=closed"
-    headers = {"Authorization": f"Bearer {token}"}
+def get_clossed_issues(owner, repo, count_only=True):
+    url = f"{http_client.API_URL}/repos/{owner}/{repo}/issues?state=closed"
+    if count_only:
+        return _count_items(url)
     page = 1
     closed_issues = []
     while True:
-        response = requests.get(f"{url}&page={page}&per_page=100", headers=headers)
+        response = _get(f"{url}&page={page}&per_page=100")
         if response.status_code == 200:
             page_closed_issues = response.json()
             if not page_closed_issues:
@@ -111,37 +187,19 @@ def get_clossed_issues(owner, repo):
     return len(closed_issues)
 
 def get_repository_age(owner, repo):
-    url = f"https://api.github.com/repos/{owner}/{repo}"
-    headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        repo_data = response.json()
-        created_at = repo_data["created_at"]
-        return created_at
-    else:
-        raise Exception(f"Error: {response.status_code}")
+    repo_data = _fetch_repository(owner, repo)
+    created_at = repo_data["created_at"]
+    return created_at
 
 def get_last_updated(owner, repo):
-    url = f"https://api.github.com/repos/{owner}/{repo}"
-    headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        repo_data = response.json()
-        updated_at = repo_data["updated_at"]
-        return updated_at
-    else:
-        raise Exception(f"Error: {response.status_code}")
+    repo_data = _fetch_repository(owner, repo)
+    updated_at = repo_data["updated_at"]
+    return updated_at
 
 def get_primary_language(owner, repo):
-    url = f"https://api.github.com/repos/{owner}/{repo}"
-    headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        repo_data = response.json()
-        primary_language = repo_data.get("language", "Unknown")
-        return primary_language
-    else:
-        raise Exception(f"Error: {response.status_code}")
+    repo_data = _fetch_repository(owner, repo)
+    primary_language = repo_data.get("language", "Unknown")
+    return primary_language
 
 def collect_and_print_repo_data(repos):
     for repo in repos:
@@ -187,3 +245,7 @@ if __name__ == "__main__":
         collect_and_print_repo_data(repos)
     else:
         print("Nenhum repositório encontrado.")
+    stats = http_client.connection_stats()
+    print(f"Requisições: {stats['requests']}, conexões abertas: {stats['connections']}, reaproveitadas: {stats['reused']}")
+    if cache is not None:
+        print(f"Respostas do cache (304): {cache.hits}, baixadas: {cache.misses}")
@@ -0,0 +1,61 @@
+import random
+import threading
+import time
+
+class RetryPolicy:
+    """Política de novas tentativas com backoff exponencial e full jitter.
+
+    A espera da tentativa n é sorteada entre 0 e min(max_delay, base_delay * 2**n);
+    quando o servidor envia Retry-After, a espera nunca é menor que ele.
+    """
+
+    def __init__(self, max_attempts=5, base_delay=1.0, max_delay=60.0, retry_statuses=(500, 502, 503, 504)):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = retry_statuses
+
+    def delay(self, attempt, retry_after=None):
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def retry_after(self, response):
+        value = response.headers.get("Retry-After")
+        return float(value) if value and value.isdigit() else None
+
+class CircuitBreaker:
+    """Pausa todas as threads depois de `failure_threshold` falhas seguidas.
+
+    Enquanto o circuito está aberto (por `cooldown` segundos) nenhuma requisição
+    é enviada, evitando que vários workers insistam ao mesmo tempo durante uma queda.
+    """
+
+    def __init__(self, failure_threshold=5, cooldown=30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        delay = self.open_until - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.open_until = time.time() + self.cooldown
+                self.failures = 0
+                print(f"{self.failure_threshold} falhas seguidas, pausando requisições por {self.cooldown:.0f}s...")
+
+# Instâncias compartilhadas por todos os coletores do processo
+retry_policy = RetryPolicy()
+breaker = CircuitBreaker()
\ No newline at end of file
@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+# A busca do GitHub não retorna mais que 1000 resultados por consulta
+SEARCH_CAP = 1000
+SHARD_WORKERS = 4
+FIRST_CREATED = date(2007, 10, 1)
+
+def _stars_qualifier(lo, hi):
+    return f"stars:{lo}" if lo == hi else f"stars:{lo}..{hi}"
+
+def _split_by_created(count_fn, stars, cap, start, end):
+    """Divide uma faixa densa (um único valor de estrelas) em intervalos de data de criação"""
+    query = f"stars:{stars} created:{start.isoformat()}..{end.isoformat()}"
+    count = count_fn(query)
+    if count == 0:
+        return []
+    if count <= cap or start == end:
+        if count > cap:
+            print(f"Aviso: {query} tem {count} resultados; apenas {cap} serão coletados")
+        return [(query, count)]
+    middle = start + (end - start) // 2
+    return (_split_by_created(count_fn, stars, cap, start, middle)
+            + _split_by_created(count_fn, stars, cap, middle + timedelta(days=1), end))
+
+def _find_lower_bound(count_fn, hi, cap, width):
+    """Menor `lo` tal que a faixa lo..hi tenha no máximo `cap` repositórios (galope + busca binária)"""
+    counts = {hi + 1: 0}
+    good = hi + 1
+    lo = hi - width + 1
+    while lo > 1:
+        counts[lo] = count_fn(_stars_qualifier(lo, hi))
+        if counts[lo] > cap:
+            break
+        good = lo
+        width *= 2
+        lo = hi - width + 1
+    else:
+        counts[1] = count_fn(_stars_qualifier(1, hi))
+        if counts[1] <= cap:
+            return 1, counts[1]
+        lo = 1
+
+    bad = lo
+    while good - bad > 1:
+        middle = (good + bad) // 2
+        counts[middle] = count_fn(_stars_qualifier(middle, hi))
+        if counts[middle] <= cap:
+            good = middle
+        else:
+            bad = middle
+    return good, counts[good]
+
+def plan_shards(count_fn, top_stars, total_repos, cap=SEARCH_CAP):
+    """Particiona a busca em consultas disjuntas, das faixas de mais estrelas para as de menos.
+
+    Cada consulta retorna no máximo `cap` repositórios; o planejamento para quando
+    as faixas cobrem `total_repos`. Retorna uma lista de (consulta, quantidade).
+    """
+    shards = []
+    covered = 0
+    hi = top_stars
+    width = 1
+    while covered < total_repos and hi >= 1:
+        lo, count = _find_lower_bound(count_fn, hi, cap, width)
+        if lo > hi:
+            # Um único valor de estrelas com mais de `cap` repositórios
+            for query, count in _split_by_created(count_fn, hi, cap, FIRST_CREATED, date.today()):
+                shards.append((query, count))
+                covered += count
+            hi -= 1
+            continue
+        shards.append((_stars_qualifier(lo, hi), count))
+        covered += count
+        width = hi - lo + 1
+        hi = lo - 1
+    return shards
+
+def search_sharded(count_fn, fetch_fn, stars_of, key_of, total_repos, cap=SEARCH_CAP, workers=SHARD_WORKERS):
+    """Coleta os `total_repos` repositórios com mais estrelas, acima do limite de 1000 da busca.
+
+    count_fn(qualificadores) -> total de resultados; fetch_fn(qualificadores, limite) -> repositórios
+    ordenados por estrelas. As faixas são buscadas em paralelo e reunidas em um ranking único.
+    """
+    top = fetch_fn("stars:>=1", 1)
+    if not top:
+        return []
+    shards = plan_shards(count_fn, stars_of(top[0]), total_repos, cap)
+    print(f"Busca dividida em {len(shards)} faixas")
+
+    limits = []
+    remaining = total_repos
+    for _, count in shards:
+        limits.append(min(count, max(remaining, 0)))
+        remaining -= count
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(fetch_fn, [query for query, _ in shards], limits)
+        repos = []
+        seen = set()
+        for shard_repos in results:
+            for repo in shard_repos:
+                # Um repositório pode mudar de faixa se ganhar estrelas durante a coleta
+                if key_of(repo) not in seen:
+                    seen.add(key_of(repo))
+                    repos.append(repo)
+
+    repos.sort(key=stars_of, reverse=True)
+    return repos[:total_repos]
\ No newline at end of file
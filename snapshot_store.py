@@ -0,0 +1,152 @@
+import argparse
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+from repo_record import FIELDS, RepoRecord, load_repositories
+
+DB_FILE = "Resultados/snapshots.sqlite"
+
+# Registros enviados por chamada de executemany
+INSERT_BATCH_SIZE = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    taken_at TEXT NOT NULL,
+    source TEXT,
+    total INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS repositories (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+    name TEXT NOT NULL,
+    owner TEXT,
+    repo_name TEXT,
+    stars INTEGER,
+    created_at TEXT,
+    updated_at TEXT,
+    pushed_at TEXT,
+    primary_language TEXT,
+    releases INTEGER,
+    open_issues INTEGER,
+    closed_issues INTEGER,
+    closed_issues_ratio REAL,
+    merged_pull_requests INTEGER,
+    PRIMARY KEY (snapshot_id, name)
+);
+CREATE INDEX IF NOT EXISTS snapshots_taken_at ON snapshots (taken_at);
+CREATE INDEX IF NOT EXISTS repositories_stars ON repositories (snapshot_id, stars DESC);
+CREATE INDEX IF NOT EXISTS repositories_language ON repositories (snapshot_id, primary_language, stars DESC);
+"""
+
+def _now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+class SnapshotStore:
+    """Histórico de coletas em SQLite: uma linha por (repositório, snapshot).
+
+    Cada coleta vira um snapshot novo em vez de sobrescrever os arquivos de
+    Resultados/, e consultas por estrelas, linguagem ou data usam índices.
+    """
+
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def save(self, records, source=None, taken_at=None):
+        """Grava os registros como um novo snapshot, em uma única transação, e retorna seu id.
+
+        `records` pode ser um gerador: os registros são inseridos em lotes com
+        executemany à medida que chegam. Se a iteração falhar, nada é gravado.
+        """
+        columns = ", ".join(FIELDS)
+        placeholders = ", ".join("?" for _ in FIELDS)
+        insert = f"INSERT INTO repositories (snapshot_id, {columns}) VALUES (?, {placeholders})"
+
+        with self.conn:
+            snapshot_id = self.conn.execute(
+                "INSERT INTO snapshots (taken_at, source) VALUES (?, ?)", (taken_at or _now(), source)
+            ).lastrowid
+            total = 0
+            batch = []
+            for record in records:
+                batch.append((snapshot_id, *(getattr(record, name) for name in FIELDS)))
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    self.conn.executemany(insert, batch)
+                    total += len(batch)
+                    batch = []
+            self.conn.executemany(insert, batch)
+            total += len(batch)
+            self.conn.execute("UPDATE snapshots SET total = ? WHERE id = ?", (total, snapshot_id))
+        return snapshot_id
+
+    def snapshots(self):
+        """Lista (id, taken_at, source, total) de todos os snapshots, do mais antigo ao mais recente"""
+        return self.conn.execute("SELECT id, taken_at, source, total FROM snapshots ORDER BY taken_at, id").fetchall()
+
+    def snapshot_id(self, as_of=None):
+        """Id do snapshot mais recente tirado até `as_of` (string ISO); None se não houver"""
+        row = self.conn.execute(
+            "SELECT id FROM snapshots WHERE taken_at <= ? ORDER BY taken_at DESC, id DESC LIMIT 1",
+            (as_of or "9999",)
+        ).fetchone()
+        return row[0] if row else None
+
+    def load(self, snapshot_id=None, language=None, limit=None):
+        """Gera os RepoRecord de um snapshot (o mais recente por padrão), por estrelas decrescentes"""
+        if snapshot_id is None:
+            snapshot_id = self.snapshot_id()
+        query = f"SELECT {', '.join(FIELDS)} FROM repositories WHERE snapshot_id = ?"
+        params = [snapshot_id]
+        if language is not None:
+            query += " AND primary_language = ?"
+            params.append(language)
+        query += " ORDER BY stars DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        for row in self.conn.execute(query, params):
+            yield RepoRecord(**dict(zip(FIELDS, row)))
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+if __name__ == "__main__":
+    # Ex.: python snapshot_store.py import Resultados/top_1000_repositories.xml
+    #      python snapshot_store.py top --language Rust --days-ago 30
+    parser = argparse.ArgumentParser(description="Histórico de snapshots em SQLite")
+    parser.add_argument("--db", default=DB_FILE)
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="grava um XML, CSV ou Parquet existente como snapshot")
+    import_parser.add_argument("file")
+    commands.add_parser("list", help="lista os snapshots")
+    top_parser = commands.add_parser("top", help="repositórios com mais estrelas de um snapshot")
+    top_parser.add_argument("--language")
+    top_parser.add_argument("--days-ago", type=int, default=0, help="usa o snapshot mais recente de N dias atrás")
+    top_parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    with SnapshotStore(args.db) as store:
+        if args.command == "import":
+            start_time = time.time()
+            snapshot_id = store.save(load_repositories(args.file), source=args.file)
+            print(f"Snapshot {snapshot_id} gravado em {time.time() - start_time:.2f} segundos")
+        elif args.command == "list":
+            for snapshot_id, taken_at, source, total in store.snapshots():
+                print(f"{snapshot_id}: {taken_at} - {total} repositórios ({source})")
+        else:
+            as_of = (datetime.now(timezone.utc) - timedelta(days=args.days_ago)).strftime("%Y-%m-%dT%H:%M:%SZ")
+            snapshot_id = store.snapshot_id(as_of)
+            if snapshot_id is None:
+                print(f"Nenhum snapshot até {as_of}")
+            else:
+                for record in store.load(snapshot_id, args.language, args.limit):
+                    print(f"{record.name}: {record.stars} estrelas ({record.primary_language})")
@@ -0,0 +1,65 @@
+import os
+import threading
+import time
+
+from rate_limit import CORE_RESOURCE, RateLimitScheduler
+
+# Tokens podem vir de GITHUB_TOKENS (separados por vírgula), GITHUB_TOKEN ou do keyring
+KEYRING_SERVICE = "lab-medicao"
+KEYRING_USERNAME = "github_tokens"
+
+def load_tokens(default=""):
+    """Carrega os tokens do ambiente ou do keyring; sem nenhum, usa `default` (a constante do script)"""
+    value = os.environ.get("GITHUB_TOKENS") or os.environ.get("GITHUB_TOKEN")
+    if not value:
+        try:
+            import keyring
+            value = keyring.get_password(KEYRING_SERVICE, KEYRING_USERNAME)
+        except Exception:
+            # keyring não instalado ou sem backend disponível
+            value = None
+
+    tokens = [token.strip() for token in (value or "").split(",") if token.strip()]
+    return tokens or [default]
+
+class TokenPool:
+    """Conjunto de tokens, cada um com um RateLimitScheduler por recurso da API.
+
+    O GitHub limita cada recurso (core, search, graphql, ...) separadamente, então
+    o orçamento é acompanhado por (token, recurso). acquire(recurso) escolhe o
+    token com mais orçamento restante naquele recurso (tokens ainda sem
+    informação ou com a janela já renovada contam como cheios; em empate, o
+    usado há mais tempo), o que distribui a coleta entre os limites de cada token.
+    """
+
+    def __init__(self, tokens):
+        self.schedulers = {token: {} for token in tokens}
+        self.last_used = {token: 0.0 for token in tokens}
+        self._lock = threading.Lock()
+
+    def _headroom(self, token, resource, now):
+        scheduler = self.schedulers[token].get(resource)
+        if scheduler is None:
+            return float("inf")
+        if scheduler.paused_until > now:
+            return -(scheduler.paused_until - now)
+        if scheduler.remaining is None or (scheduler.reset_at is not None and scheduler.reset_at <= now):
+            return float("inf")
+        return scheduler.remaining
+
+    def acquire(self, resource=CORE_RESOURCE):
+        with self._lock:
+            now = time.time()
+            token = max(self.schedulers, key=lambda t: (self._headroom(t, resource, now), -self.last_used[t]))
+            self.last_used[token] = now
+            return token
+
+    def scheduler_for(self, token, resource=CORE_RESOURCE):
+        with self._lock:
+            schedulers = self.schedulers[token]
+            if resource not in schedulers:
+                schedulers[resource] = RateLimitScheduler()
+            return schedulers[resource]
+
+    def total_cost(self):
+        return sum(scheduler.total_cost for schedulers in self.schedulers.values() for scheduler in schedulers.values())
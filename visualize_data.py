@@ -4,6 +4,9 @@ import seaborn as sns
 import numpy as np
 from collections import Counter
 import warnings
+
+from columnar import read_snapshot
+
 warnings.filterwarnings('ignore')
 
 # Configurar estilo dos gráficos
@@ -16,7 +19,7 @@ def load_and_analyze_data():
     """Carrega e analisa os dados dos repositórios"""
     
     # Carregar dados
-    df = pd.read_csv('github_1000_repositories.csv')
+    df = read_snapshot('Resultados/github_1000_repositories.csv')
     
     print(f"Dataset carregado: {len(df)} repositórios")
     print(f"Colunas: {list(df.columns)}")
@@ -0,0 +1,37 @@
+import xml.etree.ElementTree as ET
+
+class StreamingXMLWriter:
+    """Escreve um documento <root> incrementalmente, um elemento filho por vez.
+
+    Cada elemento vai para o arquivo (e é descarregado no disco) assim que é
+    escrito, então a memória usada não cresce com o número de repositórios e o
+    arquivo pode ser lido durante a coleta. A saída tem o mesmo formato do
+    antigo toprettyxml(indent="  ") do minidom.
+    """
+
+    def __init__(self, output_file, root_tag="repositories", attrib=None, indent="  "):
+        self.root_tag = root_tag
+        self.indent = indent
+        self.count = 0
+        self.file = open(output_file, "w", encoding="utf-8")
+        start = ET.tostring(ET.Element(root_tag, attrib or {}), encoding="unicode", short_empty_elements=False)
+        self.file.write('<?xml version="1.0" ?>\n')
+        self.file.write(start[:-len(f"</{root_tag}>")] + "\n")
+
+    def write(self, element):
+        if self.indent:
+            ET.indent(element, space=self.indent, level=1)
+        self.file.write(self.indent + ET.tostring(element, encoding="unicode") + "\n")
+        self.file.flush()
+        self.count += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.write(f"</{self.root_tag}>\n")
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,62 +1,113 @@
-import xml.etree.ElementTree as ET
 import csv
-from datetime import datetime
-
-def xml_to_csv(xml_file, csv_file):
-    """Convert XML data to CSV format"""
-    
-    # Parse XML
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
-    
-    # Open CSV file for writing
+import io
+import mmap
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from columnar import ParquetSnapshotWriter, merge_parquet, parquet_available, snapshot_path
+from derived_metrics import iter_rows, reference_time
+from repo_record import CSV_FIELDS, load_xml
+
+# Approximate size of each byte-range shard of a large XML file
+SHARD_SIZE = 8 * 1024 * 1024
+
+def _write_rows(records, csv_file, parquet_file=None, header=True, now=None):
+    """Write the records as CSV rows (and Parquet, if parquet_file is given); return the row count"""
+    parquet_writer = ParquetSnapshotWriter(parquet_file) if parquet_file else None
+    count = 0
+
     with open(csv_file, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = [
-            'name', 'owner', 'repo_name', 'stars', 'created_at', 'updated_at',
-            'primary_language', 'releases', 'open_issues', 'closed_issues',
-            'closed_issues_ratio', 'merged_pull_requests', 'age_years', 'days_since_update'
-        ]
-        
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        # Process each repository
-        for repo in root.findall('repository'):
-            # Extract basic data
-            created_at = repo.find('created_at').text
-            updated_at = repo.find('updated_at').text
-            
-            # Calculate age and days since update
-            created_date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-            updated_date = datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
-            current_date = datetime.now(created_date.tzinfo)
-            
-            age_years = (current_date - created_date).days / 365.25
-            days_since_update = (current_date - updated_date).days
-            
-            # Write row to CSV
-            writer.writerow({
-                'name': repo.find('name').text,
-                'owner': repo.find('owner').text,
-                'repo_name': repo.find('repo_name').text,
-                'stars': int(repo.find('stars').text),
-                'created_at': created_at,
-                'updated_at': updated_at,
-                'primary_language': repo.find('primary_language').text,
-                'releases': int(repo.find('releases').text),
-                'open_issues': int(repo.find('open_issues').text),
-                'closed_issues': int(repo.find('closed_issues').text),
-                'closed_issues_ratio': float(repo.find('closed_issues_ratio').text),
-                'merged_pull_requests': int(repo.find('merged_pull_requests').text),
-                'age_years': round(age_years, 2),
-                'days_since_update': days_since_update
-            })
-    
+        writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDS)
+        if header:
+            writer.writeheader()
+
+        # Stream repositories one at a time instead of loading the whole tree
+        for row in iter_rows(records, now):
+            writer.writerow(row)
+            if parquet_writer:
+                parquet_writer.write(row)
+            count += 1
+
+    if parquet_writer:
+        parquet_writer.close()
+    return count
+
+def xml_to_csv(xml_file, csv_file, parquet=True, now=None):
+    """Convert XML data to CSV format (and to a Parquet snapshot next to it, if pyarrow is installed)"""
+
+    parquet_file = snapshot_path(csv_file) if parquet and parquet_available() else None
+    _write_rows(load_xml(xml_file), csv_file, parquet_file, now=now)
+
     print(f"Arquivo CSV gerado: {csv_file}")
+    if parquet_file:
+        print(f"Arquivo Parquet gerado: {parquet_file}")
+
+def shard_ranges(xml_file, shard_size=SHARD_SIZE):
+    """Split the file into byte ranges of about shard_size, each starting at a <repository> tag"""
+    with open(xml_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = data.find(b"<repository>")
+        end = data.rfind(b"</repositories>")
+        if start == -1 or end == -1:
+            return []
+
+        boundaries = [start]
+        while boundaries[-1] + shard_size < end:
+            boundary = data.find(b"<repository>", boundaries[-1] + shard_size, end)
+            if boundary == -1:
+                break
+            boundaries.append(boundary)
+        boundaries.append(end)
+    return list(zip(boundaries, boundaries[1:]))
+
+def _convert_shard(xml_file, start, end, csv_file, parquet_file, now):
+    """Convert the <repository> elements in bytes [start, end) of xml_file (runs in a worker process)"""
+    with open(xml_file, 'rb') as f:
+        f.seek(start)
+        fragment = f.read(end - start)
+    document = io.BytesIO(b"<repositories>" + fragment + b"</repositories>")
+    return _write_rows(load_xml(document), csv_file, parquet_file, header=False, now=now)
+
+def convert_files(conversions, workers=None, parquet=True, shard_size=SHARD_SIZE):
+    """Convert several (xml_file, csv_file) pairs in a process pool.
+
+    Large files are split into byte-range shards on <repository> boundaries;
+    each shard is converted in parallel and the per-shard outputs are merged
+    back in the original order. All rows share the same reference time.
+    """
+    now = reference_time()
+    parquet = parquet and parquet_available()
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(conversions[0][1]))) as tmp_dir, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = []
+        for index, (xml_file, csv_file) in enumerate(conversions):
+            shards = []
+            for number, (start, end) in enumerate(shard_ranges(xml_file, shard_size)):
+                shard_csv = os.path.join(tmp_dir, f"{index}-{number}.csv")
+                shard_parquet = os.path.join(tmp_dir, f"{index}-{number}.parquet") if parquet else None
+                future = pool.submit(_convert_shard, xml_file, start, end, shard_csv, shard_parquet, now)
+                shards.append((future, shard_csv, shard_parquet))
+            jobs.append((csv_file, shards))
+
+        for csv_file, shards in jobs:
+            with open(csv_file, 'w', newline='', encoding='utf-8') as csvfile:
+                csv.DictWriter(csvfile, fieldnames=CSV_FIELDS).writeheader()
+                for future, shard_csv, _ in shards:
+                    future.result()
+                    with open(shard_csv, newline='', encoding='utf-8') as shard:
+                        shutil.copyfileobj(shard, csvfile)
+            print(f"Arquivo CSV gerado: {csv_file}")
+
+            if parquet:
+                merge_parquet([shard_parquet for _, _, shard_parquet in shards], snapshot_path(csv_file))
+                print(f"Arquivo Parquet gerado: {snapshot_path(csv_file)}")
 
 if __name__ == "__main__":
-    # Convert 1000 repositories
-    xml_to_csv("Resultados/top_1000_repositories.xml", "github_1000_repositories.csv")
-    
-    # Convert 100 repositories
-    xml_to_csv("Resultados/top_100_repositories.xml", "github_100_repositories.csv")
\ No newline at end of file
+    # Convert the 1000 and 100 repositories snapshots in parallel, next to the XML files,
+    # where the charts and analyze_data.py look for them
+    convert_files([
+        ("Resultados/top_1000_repositories.xml", "Resultados/github_1000_repositories.csv"),
+        ("Resultados/top_100_repositories.xml", "Resultados/github_100_repositories.csv"),
+    ])